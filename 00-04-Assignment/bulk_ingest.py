@@ -0,0 +1,98 @@
+# Bulk ingest → NDJSON request bodies validated and inserted in batches
+# The body is consumed chunk by chunk, so memory stays bounded by one batch (and one line of at most
+# MAX_LINE_BYTES) no matter how big the upload is.
+
+import json
+
+from fastapi.responses import StreamingResponse # type: ignore
+from pydantic import ValidationError # type: ignore
+from starlette.requests import ClientDisconnect # type: ignore
+
+
+BATCH_SIZE = 1000
+MAX_LINE_BYTES = 1024 * 1024
+
+
+async def ndjson_lines(chunks, max_line=MAX_LINE_BYTES):
+    # Re-splits arbitrary network chunks into complete lines. A line longer than `max_line` is never buffered
+    # whole: its bytes are dropped up to the next newline and it comes out as None
+    pending = b''
+    skipping = False
+    async for chunk in chunks:
+        if skipping:
+            end = chunk.find(b'\n')
+            if end < 0:
+                continue
+            chunk, skipping = chunk[end + 1:], False
+            yield None
+        pending += chunk
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            yield line if len(line) <= max_line else None
+        if len(pending) > max_line:
+            pending, skipping = b'', True
+    if skipping:
+        yield None
+    elif pending:
+        yield pending
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    # StreamingResponse normally spawns a task that calls receive() to watch for disconnects, which would swallow
+    # the request body we are still reading. Here the body iterator owns receive(): a disconnect surfaces from
+    # request.stream() as ClientDisconnect instead.
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def row_result(line, status, **extra):
+    return json.dumps({'line': line, 'status': status, **extra}).encode() + b'\n'
+
+
+async def ingest_ndjson(chunks, model, insert_batch, batch_size=BATCH_SIZE, max_line=MAX_LINE_BYTES):
+    # Yields one NDJSON result per input row: created / duplicate with the id, or error with the validation errors.
+    # `insert_batch` receives a list of validated models and returns [(model, created), ...] in the same order.
+    batch, line_numbers = [], []
+    line_no = 0
+
+    async def flush():
+        rows, numbers = list(batch), list(line_numbers)
+        batch.clear()  # before inserting: a failed insert is not retried below, nor a done one repeated
+        line_numbers.clear()
+        inserted = await insert_batch(rows)
+        for number, (item, created) in zip(numbers, inserted):
+            yield row_result(number, 'created' if created else 'duplicate', id=item.id)
+
+    try:
+        async for line in ndjson_lines(chunks, max_line):
+            line_no += 1
+            if line is None:
+                error = {'type': 'line_too_long', 'loc': [], 'msg': f'Line is longer than {max_line} bytes'}
+                yield row_result(line_no, 'error', errors=[error])
+                continue
+            if not line.strip():
+                continue
+            try:
+                batch.append(model.model_validate_json(line))
+                line_numbers.append(line_no)
+            except ValidationError as e:
+                # include_input=False: for a line that is not JSON at all, the input is the raw bytes
+                errors = e.errors(include_url=False, include_context=False, include_input=False)
+                yield row_result(line_no, 'error', errors=errors)
+                continue
+            if len(batch) >= batch_size:
+                async for result in flush():
+                    yield result
+
+        if batch:
+            async for result in flush():
+                yield result
+    except (ClientDisconnect, GeneratorExit):
+        # The client went away mid-upload (ClientDisconnect from the body) or mid-response (the response
+        # closes this generator): still keep the rows already validated. Other errors propagate as they are
+        if batch:
+            await insert_batch(list(batch))
+        raise
+
@@ -0,0 +1,36 @@
+# JSON fragment cache → each product serialized once per version, list pages assembled from bytes
+# FastAPI would otherwise run every Product (and its reviews) through jsonable_encoder on every request.
+
+from collections import OrderedDict
+
+from fastapi import Response # type: ignore
+
+
+class FragmentCache:
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self._fragments = OrderedDict()  # id → (version, JSON bytes), least recently used first
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def get(self, product, version):
+        # A fragment is reused only while the product is still at the version it was serialized from
+        entry = self._fragments.get(product.id)
+        if entry is not None and entry[0] == version:
+            self._fragments.move_to_end(product.id)
+            return entry[1]
+        fragment = product.__pydantic_serializer__.to_json(product)
+        self._fragments[product.id] = (version, fragment)
+        self._fragments.move_to_end(product.id)
+        if len(self._fragments) > self.maxsize:
+            self._fragments.popitem(last=False)
+        return fragment
+
+    def discard(self, product_id):
+        self._fragments.pop(product_id, None)
+
+
+class RawJSONResponse(Response):
+    # Body is already JSON bytes: no encoding pass at all
+    media_type = 'application/json'
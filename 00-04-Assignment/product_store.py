@@ -0,0 +1,148 @@
+# Product repository → in-memory catalog for the Product Review API
+# Replaces the bare `products` list with hash indexes so every route is O(1) instead of a list scan.
+
+import secrets
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+
+class ReviewIndex:
+    # Reviews of one product kept sorted by rating, plus running aggregates updated on every append
+    def __init__(self, reviews=()):
+        self._ratings = []     # ascending ratings, searched with bisect
+        self._by_rating = []   # the reviews, in the same order as _ratings
+        self.count = 0
+        self.total = 0.0
+        self.histogram = [0] * 6  # bucket k counts ratings in [k, k + 1); 5.0 lands in bucket 5
+        for review in reviews:
+            self.add(review)
+
+    def add(self, review):
+        i = bisect_right(self._ratings, review.rating)  # equal ratings keep arrival order
+        self._ratings.insert(i, review.rating)
+        self._by_rating.insert(i, review)
+        self.count += 1
+        self.total += review.rating
+        self.histogram[min(int(review.rating), 5)] += 1
+
+    def at_least(self, min_rating, skip=0, limit=None):
+        start = bisect_left(self._ratings, min_rating) + skip
+        return self._by_rating[start:] if limit is None else self._by_rating[start:start + limit]
+
+    def stats(self):
+        return {
+            'count': self.count,
+            'average_rating': self.total / self.count if self.count else None,
+            'histogram': {str(k): n for k, n in enumerate(self.histogram)}
+        }
+
+
+class ProductRepository:
+    blocking = False  # plain dict operations, safe to call straight from the event loop
+
+    def __init__(self):
+        self._by_id = {}           # id → Product (dicts keep insertion order, i.e. ascending id)
+        self._by_fingerprint = {}  # content fingerprint → id, used for duplicate detection
+        self._next_id = 1          # monotonic: ids are never handed out twice, even after a delete
+        self._ids = []             # ascending ids for keyset pagination; deleted ids linger until compaction
+        self._deleted = 0
+        self._reviews = {}         # id → ReviewIndex
+        self._versions = {}        # id → version, bumped whenever the product's representation changes
+        self.version = 0           # catalog version, bumped on any change (drives list ETags)
+        self.generation = secrets.token_hex(4)  # versions restart with the process, so tag them with it
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    @staticmethod
+    def fingerprint(product):
+        # Two products are duplicates when their catalog fields match; `id` and `reviews` are not content
+        return (product.name, product.description, product.price, product.in_stock)
+
+    def add(self, product):
+        # Returns (product, created). On a duplicate the already stored product is returned
+        key = self.fingerprint(product)
+        existing_id = self._by_fingerprint.get(key)
+        if existing_id is not None:
+            return self._by_id[existing_id], False
+
+        product.id = self._next_id
+        self._next_id += 1
+        self._by_id[product.id] = product
+        self._by_fingerprint[key] = product.id
+        self._ids.append(product.id)  # ids only grow, so appending keeps the list sorted
+        self._reviews[product.id] = ReviewIndex(product.reviews)
+        self._versions[product.id] = 1
+        self.version += 1
+        return product, True
+
+    def add_many(self, products):
+        return [self.add(product) for product in products]
+
+    def get(self, product_id):
+        return self._by_id.get(product_id)
+
+    def product_version(self, product_id):
+        return self._versions.get(product_id)
+
+    def product_versions(self, product_ids):
+        return {product_id: self._versions.get(product_id) for product_id in product_ids}
+
+    def catalog_version(self):
+        return self.version
+
+    def list(self, skip=0, limit=10):
+        return list(islice(self._by_id.values(), skip, skip + limit))
+
+    def page_after(self, after_id, limit=10):
+        # Keyset page: the `limit` products with id > after_id, found by bisect instead of skipping from the start
+        ids, by_id = self._ids, self._by_id
+        page = []
+        i = bisect_right(ids, after_id)
+        while i < len(ids) and len(page) < limit:
+            product = by_id.get(ids[i])
+            if product is not None:
+                page.append(product)
+            i += 1
+        return page
+
+    def add_review(self, product_id, review):
+        product = self._by_id.get(product_id)
+        if product is None:
+            return None
+        product.reviews.append(review)
+        self._reviews[product_id].add(review)
+        self._versions[product_id] += 1
+        self.version += 1
+        return product
+
+    def reviews(self, product_id, min_rating=None, skip=0, limit=None):
+        # Without min_rating: arrival order. With min_rating: ascending rating, via a bisect on the review index
+        product = self._by_id.get(product_id)
+        if product is None:
+            return None
+        if min_rating is None:
+            return product.reviews[skip:] if limit is None else product.reviews[skip:skip + limit]
+        return self._reviews[product_id].at_least(min_rating, skip, limit)
+
+    def review_stats(self, product_id):
+        index = self._reviews.get(product_id)
+        return None if index is None else index.stats()
+
+    def delete(self, product_id):
+        product = self._by_id.pop(product_id, None)
+        if product is None:
+            return False
+        del self._by_fingerprint[self.fingerprint(product)]
+        del self._reviews[product_id]
+        del self._versions[product_id]
+        self.version += 1
+        self._deleted += 1
+        if self._deleted > len(self._ids) // 2:
+            # Amortised O(1): rebuild only once deleted ids make up half of the index
+            self._ids = [i for i in self._ids if i in self._by_id]
+            self._deleted = 0
+        return True
@@ -1,6 +1,28 @@
-from fastapi import FastAPI # type: ignore
+import json
+import os
+import pathlib
+import sys
+from typing import Annotated
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response # type: ignore
+from fastapi.concurrency import run_in_threadpool # type: ignore
 from pydantic import BaseModel, Field # type: ignore
 
+from bulk_ingest import DuplexStreamingResponse, ingest_ndjson
+from fragments import FragmentCache, RawJSONResponse
+from product_store import ProductRepository
+from sqlite_store import SQLiteProductRepository
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))  # repo root, for the `shared` helpers
+from shared.conditional import etag_matches, make_etag, not_modified # noqa: E402
+from shared.debug import debug_router # noqa: E402
+from shared.instrumentation import instrument # noqa: E402
+from shared.memory import MemoryTracker, deep_sizeof # noqa: E402
+from shared.metrics import RouteMetrics # noqa: E402
+from shared.pagination import decode_cursor, encode_cursor # noqa: E402
+from shared.profiler import SamplingProfiler # noqa: E402
+from shared.tracing import SlowRequestTracer # noqa: E402
+
 
 class Review(BaseModel):
     reviewer: str = 'Anonymous'
@@ -17,20 +39,47 @@ class Product(BaseModel):
     reviews: list[Review] = []
 
 
-products: Product = []
+def create_repository():
+    # PRODUCTS_BACKEND=sqlite keeps the catalog on disk (PRODUCTS_DB) so it survives restarts and is shared by workers
+    backend = os.environ.get('PRODUCTS_BACKEND', 'memory')
+    if backend == 'sqlite':
+        return SQLiteProductRepository(os.environ.get('PRODUCTS_DB', 'products.db'), Product, Review)
+    if backend == 'memory':
+        return ProductRepository()
+    raise ValueError(f'Unknown PRODUCTS_BACKEND {backend!r}, expected "memory" or "sqlite"')
+
+
+products = create_repository()
+fragments = FragmentCache()  # serialized product JSON, reused until the product's version changes
+
+
+async def query(fn, *args):
+    # Blocking backends run in the threadpool so a query never stalls the event loop
+    if products.blocking:
+        return await run_in_threadpool(fn, *args)
+    return fn(*args)
+
 
 app = FastAPI()
+metrics = RouteMetrics()  # per route template: counts, in-flight, parse / handler / serialize latency histograms
+# Span breakdown of requests slower than TRACE_SLOW_MS or failing with a 5xx, appended to TRACE_FILE ('' = off)
+tracer = SlowRequestTracer(
+    threshold=float(os.environ.get('TRACE_SLOW_MS', '100')) / 1000,
+    capacity=int(os.environ.get('TRACE_BUFFER', '200')),
+    path=os.environ.get('TRACE_FILE', 'slow_requests.jsonl') or None,
+)
+memory = MemoryTracker()  # tracemalloc diagnostics, off until POST /debug/memory/start
+instrument(app, metrics, tracer, memory)  # must precede the routes: they are built with the instrumented route class
+profiler = SamplingProfiler()  # idle until /debug/profile is called
 
 
 @app.post('/products')
 async def product(product: Product):
-    id = len(products) + 1
-    if product not in products:
-        product.id = id
-        products.append(product)
+    product, created = await query(products.add, product)
+    if created:
         return {
             'msg': 'Product added',
-            'products': products
+            'product': product
         }
     else:
         return {
@@ -39,50 +88,107 @@ async def product(product: Product):
         }
     
 
+@app.post('/products/bulk')
+async def bulk_products(request: Request):
+    # Body: one Product JSON object per line. Response: one result line per input line, streamed as rows are inserted
+    async def insert_batch(batch):
+        return await query(products.add_many, batch)
+
+    return DuplexStreamingResponse(
+        ingest_ndjson(request.stream(), Product, insert_batch),
+        media_type='application/x-ndjson'
+    )
+
+
 @app.get('/products/{product_id}')
-async def product(product_id: int):
-    for product in products:
-        if product.id == product_id:
-            return {
-                'product': product
-            }
+async def product(product_id: int, request: Request):
+    # ETag = product version: a poll with a matching If-None-Match gets 304 without loading the product
+    version = await query(products.product_version, product_id)
+    if version is not None:
+        etag = make_etag('product', products.generation, product_id, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        product = await query(products.get, product_id)
+        if product is not None:
+            return RawJSONResponse(b'{"product":' + fragments.get(product, version) + b'}', headers={'ETag': etag})
     return {
         'msg': f'No product found with id {product_id}'
     }
 
 
 @app.get('/products')
-async def enlist_products(skip: int = 0, limit: int = 10):
-    return {
-        'products': products[skip: skip + limit]
-    }
+async def enlist_products(request: Request, skip: Annotated[int, Query(ge=0)] = 0,
+                          limit: Annotated[int, Query(ge=1, le=100)] = 10, cursor: str | None = None):
+    # Pass back `next_cursor` as `cursor` to get the next page; it resumes after the last id seen, so pages
+    # stay stable while products are added or deleted and the whole catalog can be walked. `skip` is for
+    # offset pages only and cannot be combined with `cursor`
+    if cursor is not None:
+        if skip:
+            raise HTTPException(status_code=400, detail='skip cannot be combined with cursor')
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if type(after_id) is not int or after_id < 0:  # bool is an int subclass, so isinstance would let it in
+            raise HTTPException(status_code=400, detail=f'Invalid cursor {cursor!r}')
+    etag = make_etag('products', products.generation, await query(products.catalog_version), skip, limit, cursor or '')
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if cursor is not None:
+        page = await query(products.page_after, after_id, limit)
+    else:
+        page = await query(products.list, skip, limit)
+    next_cursor = encode_cursor(page[-1].id) if page and len(page) == limit else None
+
+    # The body is stitched together from cached per-product JSON instead of re-encoding every product
+    versions = await query(products.product_versions, [p.id for p in page])
+    body = b','.join(fragments.get(p, versions.get(p.id)) for p in page)
+    return RawJSONResponse(
+        b'{"products":[' + body + b'],"next_cursor":' + json.dumps(next_cursor).encode() + b'}',
+        headers={'ETag': etag}
+    )
 
 
 @app.put('/products/{product_id}/reviews')
 async def review(product_id: int, review: Review):
-    for product in products:
-        if product.id == product_id:
-            product.reviews.append(review)
-            return {
-                'product': product
-            }
+    product = await query(products.add_review, product_id, review)
+    fragments.discard(product_id)
+    if product is not None:
+        return {
+            'product': product
+        }
     return {
         'msg': f'No product found with id {product_id}'
     }
 
 
 @app.get('/products/{product_id}/reviews')
-async def reviews(product_id: int, min_rating: float | None = None):
-    for product in products:
-        if product.id == product_id:
-            if min_rating is not None:
-                return {
-                    'reviews': [r for r in product.reviews if r.rating >= min_rating]
-                }
-            else:
-                return {
-                    'reviews': product.reviews
-                }
+async def reviews(product_id: int, request: Request, response: Response, min_rating: float | None = None,
+                  skip: Annotated[int, Query(ge=0)] = 0, limit: Annotated[int | None, Query(ge=1, le=100)] = None):
+    # With min_rating the matching reviews come back in ascending rating order
+    version = await query(products.product_version, product_id)
+    if version is not None:
+        etag = make_etag('reviews', products.generation, product_id, version, min_rating, skip, limit)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers['ETag'] = etag
+    found = await query(products.reviews, product_id, min_rating, skip, limit)
+    if found is not None:
+        return {
+            'reviews': found
+        }
+    return {
+        'msg': f'No product found with id {product_id}'
+    }
+
+
+@app.get('/products/{product_id}/reviews/stats')
+async def review_stats(product_id: int):
+    stats = await query(products.review_stats, product_id)
+    if stats is not None:
+        return {
+            'stats': stats
+        }
     return {
         'msg': f'No product found with id {product_id}'
     }
@@ -90,8 +196,34 @@ async def reviews(product_id: int, min_rating: float | None = None):
 
 @app.delete('/products/{product_id}')
 async def delete(product_id: int):
-    global products
-    products = [p for p in products if p.id != product_id]
+    fragments.discard(product_id)
+    if await query(products.delete, product_id):
+        return {
+            'msg': f'Product with id {product_id} deleted'
+        }
+    return {
+        'msg': f'No product found with id {product_id}'
+    }
+
+
+def store_sizes():
+    # Entries and deep size in bytes of the long-lived in-memory structures
+    return {
+        'products': {'items': len(products), 'bytes': deep_sizeof(products)},
+        'fragments': {'items': len(fragments), 'bytes': deep_sizeof(fragments)},
+    }
+
+
+# /metrics and the token-guarded /debug/* routes (traces, profile, memory)
+app.include_router(debug_router(metrics, tracer, profiler, memory, store_sizes, app.router.route_class))
+
+
+# BULK LOAD VIA NDJSON (one product per line)
+
+# curl -X 'POST' \
+#   'http://127.0.0.1:8000/products/bulk' \
+#   -H 'Content-Type: application/x-ndjson' \
+#   --data-binary @products.ndjson
 
 # TEST ITEMS ADDED VIA POST PATH OPERATION
 
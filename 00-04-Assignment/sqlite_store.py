@@ -0,0 +1,264 @@
+# SQLite product repository → persistent drop-in replacement for ProductRepository
+# Same methods as the in-memory store, backed by a WAL-mode database file that several workers can share.
+
+import contextlib
+import json
+import queue
+import secrets
+import sqlite3
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS products (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,  -- AUTOINCREMENT: ids are never reused after a delete
+    name        TEXT NOT NULL,
+    description TEXT,
+    price       REAL NOT NULL,
+    in_stock    REAL,
+    fingerprint TEXT NOT NULL UNIQUE,               -- duplicate detection, see ProductRepository.fingerprint
+    version     INTEGER NOT NULL DEFAULT 1          -- bumped whenever a review is added, drives ETags
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    id          INTEGER PRIMARY KEY,
+    product_id  INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    reviewer    TEXT NOT NULL,
+    rating      REAL NOT NULL,
+    comment     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reviews_by_product ON reviews(product_id);
+CREATE INDEX IF NOT EXISTS reviews_by_product_rating ON reviews(product_id, rating);
+CREATE TABLE IF NOT EXISTS review_stats (
+    product_id  INTEGER PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+    count       INTEGER NOT NULL DEFAULT 0,
+    total       REAL NOT NULL DEFAULT 0,
+    h0 INTEGER NOT NULL DEFAULT 0, h1 INTEGER NOT NULL DEFAULT 0, h2 INTEGER NOT NULL DEFAULT 0,
+    h3 INTEGER NOT NULL DEFAULT 0, h4 INTEGER NOT NULL DEFAULT 0, h5 INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS catalog (
+    id          INTEGER PRIMARY KEY CHECK (id = 1),
+    version     INTEGER NOT NULL,                   -- bumped on any change, drives list ETags
+    generation  TEXT NOT NULL                       -- identifies this database in ETags
+);
+CREATE TRIGGER IF NOT EXISTS products_bump_catalog_on_insert AFTER INSERT ON products
+BEGIN
+    UPDATE catalog SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS products_bump_catalog_on_delete AFTER DELETE ON products
+BEGIN
+    UPDATE catalog SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS reviews_bump_versions AFTER INSERT ON reviews
+BEGIN
+    UPDATE products SET version = version + 1 WHERE id = NEW.product_id;
+    UPDATE catalog SET version = version + 1;
+END;
+-- Aggregates are maintained in the same transaction as the review insert, see ReviewIndex for the buckets
+CREATE TRIGGER IF NOT EXISTS reviews_update_stats AFTER INSERT ON reviews
+BEGIN
+    INSERT INTO review_stats (product_id) VALUES (NEW.product_id) ON CONFLICT DO NOTHING;
+    UPDATE review_stats SET
+        count = count + 1,
+        total = total + NEW.rating,
+        h0 = h0 + (MIN(CAST(NEW.rating AS INTEGER), 5) = 0),
+        h1 = h1 + (MIN(CAST(NEW.rating AS INTEGER), 5) = 1),
+        h2 = h2 + (MIN(CAST(NEW.rating AS INTEGER), 5) = 2),
+        h3 = h3 + (MIN(CAST(NEW.rating AS INTEGER), 5) = 3),
+        h4 = h4 + (MIN(CAST(NEW.rating AS INTEGER), 5) = 4),
+        h5 = h5 + (MIN(CAST(NEW.rating AS INTEGER), 5) = 5)
+    WHERE product_id = NEW.product_id;
+END;
+'''
+
+# Statements are constant strings so sqlite3's per-connection statement cache keeps them prepared
+INSERT_PRODUCT = 'INSERT INTO products (name, description, price, in_stock, fingerprint) VALUES (?, ?, ?, ?, ?)'
+SELECT_BY_FINGERPRINT = 'SELECT id, name, description, price, in_stock FROM products WHERE fingerprint = ?'
+SELECT_PRODUCT = 'SELECT id, name, description, price, in_stock FROM products WHERE id = ?'
+SELECT_PAGE = 'SELECT id, name, description, price, in_stock FROM products ORDER BY id LIMIT ? OFFSET ?'
+SELECT_PAGE_AFTER = 'SELECT id, name, description, price, in_stock FROM products WHERE id > ? ORDER BY id LIMIT ?'
+COUNT_PRODUCTS = 'SELECT COUNT(*) FROM products'
+DELETE_PRODUCT = 'DELETE FROM products WHERE id = ?'
+INSERT_REVIEW = 'INSERT INTO reviews (product_id, reviewer, rating, comment) VALUES (?, ?, ?, ?)'
+SELECT_REVIEWS = 'SELECT product_id, reviewer, rating, comment FROM reviews WHERE product_id = ? ORDER BY id'
+SELECT_REVIEWS_PAGE = '''
+SELECT product_id, reviewer, rating, comment FROM reviews WHERE product_id = ? ORDER BY id LIMIT ? OFFSET ?
+'''
+SELECT_REVIEWS_MIN_RATING = '''
+SELECT product_id, reviewer, rating, comment FROM reviews WHERE product_id = ? AND rating >= ?
+ORDER BY rating, id LIMIT ? OFFSET ?
+'''
+SELECT_PRODUCT_VERSION = 'SELECT version FROM products WHERE id = ?'
+SELECT_PRODUCT_VERSIONS = 'SELECT id, version FROM products WHERE id IN (SELECT value FROM json_each(?))'
+SELECT_CATALOG = 'SELECT version, generation FROM catalog WHERE id = 1'
+SELECT_REVIEW_STATS = 'SELECT count, total, h0, h1, h2, h3, h4, h5 FROM review_stats WHERE product_id = ?'
+SELECT_REVIEWS_FOR_MANY = '''
+SELECT product_id, reviewer, rating, comment FROM reviews
+WHERE product_id IN (SELECT value FROM json_each(?)) ORDER BY id
+'''
+
+
+class ConnectionPool:
+    # A fixed set of connections handed out to threadpool workers; callers block while all are busy
+    def __init__(self, path, size=4):
+        self._idle = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, cached_statements=128)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = NORMAL')
+            conn.execute('PRAGMA foreign_keys = ON')
+            conn.execute('PRAGMA busy_timeout = 5000')
+            self._idle.put(conn)
+        self.size = size
+
+    @contextlib.contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent writers queue instead of deadlocking
+        with self.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+class SQLiteProductRepository:
+    blocking = True  # every call does I/O, so the routes run it in the threadpool
+
+    def __init__(self, path, product_model, review_model, pool_size=4):
+        self._product_model = product_model
+        self._review_model = review_model
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+            conn.execute(
+                'INSERT OR IGNORE INTO catalog (id, version, generation) VALUES (1, 0, ?)', (secrets.token_hex(4),)
+            )
+            self.generation = conn.execute(SELECT_CATALOG).fetchone()[1]
+
+    def __len__(self):
+        with self.pool.connection() as conn:
+            return conn.execute(COUNT_PRODUCTS).fetchone()[0]
+
+    @staticmethod
+    def fingerprint(product):
+        return json.dumps([product.name, product.description, product.price, product.in_stock])
+
+    def _product(self, row, reviews):
+        id, name, description, price, in_stock = row
+        return self._product_model(
+            id=id, name=name, description=description, price=price, in_stock=in_stock, reviews=reviews
+        )
+
+    def _review(self, row):
+        _, reviewer, rating, comment = row
+        return self._review_model(reviewer=reviewer, rating=rating, comment=comment)
+
+    def _insert(self, conn, product):
+        # Look the fingerprint up first: a conflicting INSERT would still use up an AUTOINCREMENT id. Safe
+        # without a race, the caller's transaction holds the write lock
+        key = self.fingerprint(product)
+        row = conn.execute(SELECT_BY_FINGERPRINT, (key,)).fetchone()
+        if row is not None:
+            reviews = [self._review(r) for r in conn.execute(SELECT_REVIEWS, (row[0],))]
+            return self._product(row, reviews), False
+
+        cursor = conn.execute(
+            INSERT_PRODUCT, (product.name, product.description, product.price, product.in_stock, key)
+        )
+        product.id = cursor.lastrowid
+        conn.executemany(
+            INSERT_REVIEW, [(product.id, r.reviewer, r.rating, r.comment) for r in product.reviews]
+        )
+        return product, True
+
+    def add(self, product):
+        with self.pool.transaction() as conn:
+            return self._insert(conn, product)
+
+    def add_many(self, products):
+        # One transaction (and one fsync) for the whole batch instead of one per product
+        with self.pool.transaction() as conn:
+            return [self._insert(conn, product) for product in products]
+
+    def get(self, product_id):
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_PRODUCT, (product_id,)).fetchone()
+            if row is None:
+                return None
+            return self._product(row, [self._review(r) for r in conn.execute(SELECT_REVIEWS, (product_id,))])
+
+    def product_version(self, product_id):
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_PRODUCT_VERSION, (product_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def product_versions(self, product_ids):
+        with self.pool.connection() as conn:
+            return dict(conn.execute(SELECT_PRODUCT_VERSIONS, (json.dumps(list(product_ids)),)).fetchall())
+
+    def catalog_version(self):
+        with self.pool.connection() as conn:
+            return conn.execute(SELECT_CATALOG).fetchone()[0]
+
+    def list(self, skip=0, limit=10):
+        return self._page(SELECT_PAGE, (limit, skip))
+
+    def page_after(self, after_id, limit=10):
+        # Keyset page: a primary-key range seek, no OFFSET rows to walk past
+        return self._page(SELECT_PAGE_AFTER, (after_id, limit))
+
+    def _page(self, sql, params):
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+            reviews = {row[0]: [] for row in rows}
+            for r in conn.execute(SELECT_REVIEWS_FOR_MANY, (json.dumps(list(reviews)),)):
+                reviews[r[0]].append(self._review(r))
+        return [self._product(row, reviews[row[0]]) for row in rows]
+
+    def add_review(self, product_id, review):
+        with self.pool.transaction() as conn:
+            if conn.execute(SELECT_PRODUCT, (product_id,)).fetchone() is None:
+                return None
+            conn.execute(INSERT_REVIEW, (product_id, review.reviewer, review.rating, review.comment))
+        return self.get(product_id)
+
+    def reviews(self, product_id, min_rating=None, skip=0, limit=None):
+        # Same ordering as ProductRepository.reviews; the (product_id, rating) index serves the min_rating range
+        limit = -1 if limit is None else limit  # LIMIT -1 means no limit in SQLite
+        with self.pool.connection() as conn:
+            if conn.execute(SELECT_PRODUCT, (product_id,)).fetchone() is None:
+                return None
+            if min_rating is None:
+                rows = conn.execute(SELECT_REVIEWS_PAGE, (product_id, limit, skip))
+            else:
+                rows = conn.execute(SELECT_REVIEWS_MIN_RATING, (product_id, min_rating, limit, skip))
+            return [self._review(r) for r in rows]
+
+    def review_stats(self, product_id):
+        with self.pool.connection() as conn:
+            if conn.execute(SELECT_PRODUCT, (product_id,)).fetchone() is None:
+                return None
+            row = conn.execute(SELECT_REVIEW_STATS, (product_id,)).fetchone() or (0, 0.0) + (0,) * 6
+        count, total, *histogram = row
+        return {
+            'count': count,
+            'average_rating': total / count if count else None,
+            'histogram': {str(k): n for k, n in enumerate(histogram)}
+        }
+
+    def delete(self, product_id):
+        with self.pool.transaction() as conn:
+            return conn.execute(DELETE_PRODUCT, (product_id,)).rowcount > 0
@@ -0,0 +1,126 @@
+# News corpus → NDJSON file loaded at startup and watched for changes
+# Records are parsed one line at a time, so memory is bounded by the store itself, not the file. Lines that fail
+# validation are reported and skipped. The watcher applies appended or edited records to the live store without
+# rebuilding it.
+
+import asyncio
+import collections
+import hashlib
+import logging
+import os
+
+from fastapi.concurrency import run_in_threadpool # type: ignore
+from pydantic import ValidationError # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+TAIL = 256        # bytes before the read offset that must be unchanged for the file to count as appended to
+APPLY_BATCH = 500  # records applied per event-loop turn, so requests keep being served during a big update
+
+
+class NewsCorpus:
+    def __init__(self, path, model, store, interval=1.0):
+        self.path = path
+        self.model = model           # validates each record, e.g. NewsArticle
+        self.store = store           # NewsIndex / ColumnarNewsStore: add, add_many, remove, get, iteration
+        self.interval = interval
+        self.errors = collections.deque(maxlen=100)  # most recent bad lines
+        self.loaded = 0              # records applied since startup
+        self._offset = 0             # bytes consumed (always just after a newline)
+        self._tail = b''
+        self._stat = None
+
+    def status(self):
+        return {
+            'path': str(self.path),
+            'articles': len(self.store),
+            'loaded': self.loaded,
+            'offset': self._offset,
+            'errors': list(self.errors),
+        }
+
+    def read(self, start=0):
+        # Yields validated records from byte `start` onwards; stops before a trailing line with no newline yet
+        # (a writer may be half way through it). Updates the read offset as it goes
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    yield self.model.model_validate_json(line).model_dump(mode='json')
+                except ValidationError as e:
+                    # No `input`: a bad line may not be UTF-8, and GET /corpus has to serialize these errors
+                    errors = e.errors(include_url=False, include_context=False, include_input=False)
+                    error = {'offset': offset - len(line), 'errors': errors}
+                    self.errors.append(error)
+                    logger.warning('Skipping bad record in %s at byte %d (%d validation errors)',
+                                   self.path, error['offset'], e.error_count())
+            self._offset = offset
+            self._tail = self._read_tail(f, offset)
+
+    @staticmethod
+    def _read_tail(f, offset):
+        f.seek(max(0, offset - TAIL))
+        return hashlib.blake2b(f.read(min(offset, TAIL))).digest()
+
+    def load(self):
+        self._stat = os.stat(self.path)
+        before = len(self.store)
+        self.store.add_many(self.read())
+        self.loaded += len(self.store) - before
+        logger.info('Loaded %d articles from %s', len(self.store), self.path)
+
+    def changes(self):
+        # Runs in a worker thread: works out what changed on disk, returns (upserts, removed ids) without
+        # touching the store
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return [], []
+        previous, self._stat = self._stat, stat
+        signature = lambda s: (s.st_ino, s.st_size, s.st_mtime_ns)  # noqa: E731
+        if previous is not None and signature(stat) == signature(previous):
+            return [], []
+
+        if previous is not None and stat.st_ino == previous.st_ino and stat.st_size > self._offset:
+            with open(self.path, 'rb') as f:
+                appended = self._read_tail(f, self._offset) == self._tail
+            if appended:
+                return list(self.read(self._offset)), []
+
+        # Rewritten or edited in place: stream it again and diff against the live store
+        records = {record['id']: record for record in self.read()}
+        upserts = [record for news_id, record in records.items() if self.store.get(news_id) != record]
+        removed = [article['id'] for article in self.store if article['id'] not in records]
+        return upserts, removed
+
+    async def apply(self, upserts, removed):
+        # Runs on the event loop in batches of APPLY_BATCH: each record's remove / add completes between two
+        # requests, so no request sees a half-updated record or index entry. The update as a whole is not
+        # atomic: a request served between batches can see some of the changes but not yet the others
+        for i in range(0, len(removed), APPLY_BATCH):
+            for news_id in removed[i:i + APPLY_BATCH]:
+                self.store.remove(news_id)
+            await asyncio.sleep(0)
+        for i in range(0, len(upserts), APPLY_BATCH):
+            for record in upserts[i:i + APPLY_BATCH]:
+                self.store.add(record)
+            await asyncio.sleep(0)
+        self.loaded += len(upserts)
+        if upserts or removed:
+            logger.info('Applied %d changed and %d removed articles from %s', len(upserts), len(removed), self.path)
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                upserts, removed = await run_in_threadpool(self.changes)
+                await self.apply(upserts, removed)
+            except Exception:
+                logger.exception('Reloading %s failed', self.path)
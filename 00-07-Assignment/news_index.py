@@ -0,0 +1,213 @@
+# News index → posting lists for the NewsAPI filters
+# Every filter value maps to the ascending list of article ids that carry it, so GET /news touches only the
+# articles that can match instead of re-filtering the whole dataset on every request. A page is read by bisecting
+# the smallest list to the cursor and walking it until offset + limit matches are found, so its cost does not
+# grow with how many articles match in total.
+
+import datetime
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+
+from news_search import SearchIndex
+
+
+def to_epoch(value):
+    # ISO strings or datetimes → POSIX seconds; naive values are taken as UTC so they compare with aware ones
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+class NewsIndex:
+    def __init__(self, articles=()):
+        self.by_id = {}                          # id → article dict
+        self.ids = []                            # ascending ids: default result order and cursor position
+        self.by_media_house = defaultdict(list)  # media_house → ascending ids
+        self.by_category = defaultdict(list)     # category → ascending ids
+        self.by_keyword = defaultdict(list)      # lower-cased keyword → ascending ids
+        self.epoch_of = {}                       # id → parsed updated_at, parsed once at insert
+        self.by_time = []                        # ascending (epoch, id), bisected for updated_after
+        self.search = SearchIndex()              # BM25 over title + summary
+        self.version = 0                         # bumped on every change, lets caches detect stale results
+        self.version_of = {}                     # id → store version that last wrote the article (ETags)
+        self.add_many(articles)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return (self.by_id[news_id] for news_id in self.ids)
+
+    def get(self, news_id):
+        return self.by_id.get(news_id)
+
+    def article_version(self, news_id):
+        return self.version_of.get(news_id)
+
+    def add(self, article):
+        # Insert or replace (same id) an article and update every posting list
+        if article['id'] in self.by_id:
+            self.remove(article['id'])
+        self._insert(article, keep_sorted=True)
+        self.version += 1
+
+    def add_many(self, articles):
+        # Bulk load: append everything, then sort ids and times once instead of an O(n) insort per article
+        latest = {article['id']: article for article in articles}  # last one wins, like repeated add()
+        for news_id in latest.keys() & self.by_id.keys():
+            self.remove(news_id)
+        for article in latest.values():
+            self._insert(article, keep_sorted=False)
+        self.ids.sort()
+        self.by_time.sort()
+        for postings in (self.by_media_house, self.by_category, self.by_keyword):
+            for ids in postings.values():
+                ids.sort()
+        self.version += 1
+
+    def _insert(self, article, keep_sorted):
+        news_id = article['id']
+        epoch = to_epoch(article['updated_at'])
+        self.by_id[news_id] = article
+        self.version_of[news_id] = self.version + 1
+        self._append(self.ids, news_id, keep_sorted)
+        self._append(self.by_media_house[article['media_house']], news_id, keep_sorted)
+        self._append(self.by_category[article['category']], news_id, keep_sorted)
+        for keyword in self.keywords_of(article):
+            self._append(self.by_keyword[keyword], news_id, keep_sorted)
+        self.epoch_of[news_id] = epoch
+        if keep_sorted:
+            insort(self.by_time, (epoch, news_id))
+        else:
+            self.by_time.append((epoch, news_id))
+        self.search.add(news_id, SearchIndex.text_of(article))
+
+    def remove(self, news_id):
+        article = self.by_id.pop(news_id, None)
+        if article is None:
+            return None
+        del self.ids[bisect_right(self.ids, news_id) - 1]
+        del self.version_of[news_id]
+        self._discard(self.by_media_house, article['media_house'], news_id)
+        self._discard(self.by_category, article['category'], news_id)
+        for keyword in self.keywords_of(article):
+            self._discard(self.by_keyword, keyword, news_id)
+        epoch = self.epoch_of.pop(news_id)
+        del self.by_time[bisect_right(self.by_time, (epoch, news_id)) - 1]
+        self.search.remove(news_id, SearchIndex.text_of(article))
+        self.version += 1
+        return article
+
+    @staticmethod
+    def keywords_of(article):
+        return {keyword.lower() for keyword in article.get('keywords', [])}
+
+    @staticmethod
+    def _append(ids, news_id, keep_sorted):
+        # New ids are usually the largest yet, so keeping a list sorted is an append, not an insort
+        if not keep_sorted or not ids or ids[-1] < news_id:
+            ids.append(news_id)
+        else:
+            insort(ids, news_id)
+
+    @staticmethod
+    def _discard(postings, key, news_id):
+        ids = postings[key]
+        del ids[bisect_left(ids, news_id)]
+        if not ids:
+            del postings[key]
+
+    @staticmethod
+    def _contains(ids, news_id):
+        i = bisect_left(ids, news_id)
+        return i < len(ids) and ids[i] == news_id
+
+    def query(self, media_house=None, category=None, keyword=None, updated_after=None, q=None,
+              after=None, offset=0, limit=10):
+        # Returns (page, last sort key). Without `q` results are in id order and the key is the id; with `q` they
+        # are BM25-ranked and the key is [score, id]. `after` is the key a previous page ended on (keyset cursor)
+        if q is not None:
+            hits = self._search(q, media_house, category, keyword, updated_after, after, offset + limit)[offset:]
+            return [self.by_id[news_id] for _, news_id in hits], (list(hits[-1]) if hits else None)
+
+        ids = self.match_ids(media_house, category, keyword, updated_after, after=after, limit=offset + limit)
+        page = [self.by_id[news_id] for news_id in ids[offset:]]
+        return page, (page[-1]['id'] if page else None)
+
+    def _search(self, q, media_house, category, keyword, updated_after, after, k):
+        filters = self._filter_sets(media_house, category, keyword, updated_after)
+        if filters is None:
+            return []
+        sets, cut, recent = filters
+        if not sets and cut is None:
+            return self.search.top(q, k, after=after)
+
+        # Walk the ranked postings and probe the filters per hit, for at most as many documents as scoring
+        # everything that passes the filters would take; past that, do the latter
+        epoch_of = self.epoch_of
+
+        def accept(news_id):
+            return (all(self._contains(ids, news_id) for ids in sets)
+                    and (cut is None or epoch_of[news_id] > cut))
+        smallest = min([len(ids) for ids in sets] + ([recent] if cut is not None else []))
+        hits = self.search.top(q, k, accept=accept, after=after, budget=smallest)
+        if hits is None:
+            candidates = set(self.match_ids(media_house, category, keyword, updated_after))
+            hits = self.search.top(q, k, candidates=candidates, after=after)
+        return hits
+
+    def _filter_sets(self, media_house, category, keyword, updated_after):
+        # (posting lists, updated_after epoch, number of newer articles), or None when a filter matches nothing
+        sets = []
+        for postings, value in ((self.by_media_house, media_house),
+                                (self.by_category, category),
+                                (self.by_keyword, keyword and keyword.lower())):
+            if value is not None:
+                ids = postings.get(value)
+                if not ids:
+                    return None
+                sets.append(ids)
+
+        cut, recent = None, 0
+        if updated_after is not None:
+            cut = to_epoch(updated_after)
+            recent = len(self.by_time) - bisect_right(self.by_time, (cut, math.inf))
+            if recent == 0:
+                return None
+        return sets, cut, recent
+
+    def match_ids(self, media_house=None, category=None, keyword=None, updated_after=None, after=None, limit=None):
+        # Query planner: ascending ids of the matching articles above `after`, at most `limit` of them (None = all).
+        # Walks the smallest posting list from the cursor and probes the others, stopping once `limit` ids matched
+        if media_house is None and category is None and keyword is None and updated_after is None:
+            start = 0 if after is None else bisect_right(self.ids, after)
+            return self.ids[start:None if limit is None else start + limit]
+
+        filters = self._filter_sets(media_house, category, keyword, updated_after)
+        if filters is None or limit == 0:
+            return []
+        lists, cut, recent = filters
+        lists.sort(key=len)
+        epoch_of = self.epoch_of
+
+        driver, probes = (lists[0], lists[1:]) if lists else (self.ids, [])
+        # Walking the driver to `limit` matches reads about limit · len(driver) / recent ids when the time range
+        # is the filter that rejects most of them; collecting the range reads `recent`
+        if cut is not None and recent < len(driver) and (limit is None or recent * recent < limit * len(driver)):
+            # Drive from the time range: its ids are in time order, so collect and sort them
+            matched = sorted(news_id for _, news_id in self.by_time[len(self.by_time) - recent:]
+                             if (after is None or news_id > after)
+                             and all(self._contains(ids, news_id) for ids in lists))
+            return matched[:limit]
+
+        matched = []
+        for i in range(0 if after is None else bisect_right(driver, after), len(driver)):
+            news_id = driver[i]
+            if (cut is None or epoch_of[news_id] > cut) and all(self._contains(ids, news_id) for ids in probes):
+                matched.append(news_id)
+                if len(matched) == limit:
+                    break
+        return matched
@@ -0,0 +1,172 @@
+# Full-text search → BM25-ranked inverted index over news titles and summaries
+# Built once at load and updated per article, so a query only touches the postings of its own terms.
+# A term's BM25 contribution depends only on the document's term frequency and length, so each posting list is
+# also kept grouped by (tf, length). top() scores those groups (a few hundred at most), visits them best first
+# and stops as soon as no unvisited document can still beat the k-th result (the threshold algorithm), instead
+# of scoring every document that contains a query term.
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+
+
+TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+class SearchIndex:
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)  # term → {id: term frequency}
+        self.impacts = defaultdict(dict)   # term → {(tf, doc length): ascending ids}, the same postings by impact
+        self.doc_len = {}                  # id → number of tokens
+        self.total_len = 0
+
+    def __len__(self):
+        return len(self.doc_len)
+
+    @staticmethod
+    def text_of(article):
+        return f"{article.get('title', '')} {article.get('summary', '')}"
+
+    def add(self, news_id, text):
+        if news_id in self.doc_len:
+            self.remove(news_id, text)
+        tokens = tokenize(text)
+        for term, tf in Counter(tokens).items():
+            self.postings[term][news_id] = tf
+            ids = self.impacts[term].setdefault((tf, len(tokens)), [])
+            if not ids or ids[-1] < news_id:
+                ids.append(news_id)
+            else:
+                insort(ids, news_id)
+        self.doc_len[news_id] = len(tokens)
+        self.total_len += len(tokens)
+
+    def remove(self, news_id, text):
+        # `text` must be what the article was indexed with; re-tokenizing it finds its postings
+        length = self.doc_len.pop(news_id, None)
+        if length is None:
+            return
+        self.total_len -= length
+        for term in set(tokenize(text)):
+            docs = self.postings.get(term)
+            if docs is None or news_id not in docs:
+                continue
+            groups = self.impacts[term]
+            key = (docs.pop(news_id), length)
+            ids = groups[key]
+            del ids[bisect_left(ids, news_id)]
+            if not ids:
+                del groups[key]
+            if not docs:
+                del self.postings[term]
+                del self.impacts[term]
+
+    def terms_of(self, query):
+        # Indexed query terms, in the one order both scoring paths add contributions in (identical float sums)
+        return sorted(term for term in set(tokenize(query)) if term in self.postings)
+
+    def idf(self, term, n):
+        df = len(self.postings[term])
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def contribution(self, idf, tf, length, avgdl):
+        k1 = self.k1
+        return idf * tf * (k1 + 1) / (tf + k1 * (1 - self.b + self.b * length / avgdl))
+
+    def scores(self, query, candidates=None):
+        # BM25 score of every document containing at least one query term, optionally restricted to `candidates`
+        n = len(self.doc_len)
+        if n == 0:
+            return {}
+        avgdl = self.total_len / n
+        doc_len = self.doc_len
+        scores = defaultdict(float)
+        for term in self.terms_of(query):
+            docs = self.postings[term]
+            idf = self.idf(term, n)
+            if candidates is not None and len(candidates) < len(docs):
+                docs = {news_id: docs[news_id] for news_id in candidates if news_id in docs}
+            elif candidates is not None:
+                docs = {news_id: tf for news_id, tf in docs.items() if news_id in candidates}
+            for news_id, tf in docs.items():
+                scores[news_id] += self.contribution(idf, tf, doc_len[news_id], avgdl)
+        return scores
+
+    def top(self, query, k, candidates=None, accept=None, after=None, budget=None):
+        # Top-k (score, id) pairs ordered by score desc, id asc. `candidates` restricts scoring to a set of ids,
+        # `accept` filters scored ids with a predicate. `after` is the last (score, id) of the previous page:
+        # only results ranked strictly below it are returned. With a `budget`, gives up (None) once that many
+        # documents were visited without settling the top k
+        if candidates is not None:
+            # Already narrowed down by the caller: score them all
+            ranked = ((score, news_id) for news_id, score in self.scores(query, candidates).items())
+            if accept is not None:
+                ranked = ((score, news_id) for score, news_id in ranked if accept(news_id))
+            if after is not None:
+                ranked = ((score, news_id) for score, news_id in ranked if self.below(score, news_id, after))
+            return heapq.nsmallest(k, ranked, key=lambda hit: (-hit[0], hit[1]))
+
+        terms = self.terms_of(query)
+        n = len(self.doc_len)
+        if not terms or k <= 0:
+            return []
+        avgdl = self.total_len / n
+        weights = []  # per term: {(tf, length): contribution}
+        groups = []   # per term: [(contribution, ids)] best first; the head is the next group to visit
+        for term in terms:
+            idf = self.idf(term, n)
+            weight = {key: self.contribution(idf, *key, avgdl) for key in self.impacts[term]}
+            weights.append(weight)
+            groups.append(sorted(((weight[key], ids) for key, ids in self.impacts[term].items()),
+                                 key=lambda group: group[0]))  # popped from the end, best first
+        postings = [self.postings[term] for term in terms]
+        doc_len = self.doc_len
+
+        best = []     # min-heap of (score, -id): the worst of the current top-k on top
+        seen = set()
+        while True:
+            heads = [group[-1][0] if group else 0.0 for group in groups]
+            threshold = sum(heads)  # the most an unvisited document can still score
+            if len(best) == k and best[0][0] > threshold:
+                break
+            t = max(range(len(terms)), key=heads.__getitem__)
+            if not groups[t]:
+                break  # every posting visited
+            head, ids = groups[t].pop()
+            for news_id in ids:
+                if news_id in seen:
+                    continue
+                seen.add(news_id)
+                if budget is not None and len(seen) > budget:
+                    return None
+                if accept is None or accept(news_id):
+                    length = doc_len[news_id]
+                    score = 0.0
+                    for posting, weight in zip(postings, weights):
+                        tf = posting.get(news_id)
+                        if tf:
+                            score += weight[tf, length]
+                    if after is None or self.below(score, news_id, after):
+                        if len(best) < k:
+                            heapq.heappush(best, (score, -news_id))
+                        elif (score, -news_id) > best[0]:
+                            heapq.heapreplace(best, (score, -news_id))
+                # An unvisited document scoring exactly `threshold` sits in this group after `news_id` (ids ascend)
+                if len(best) == k and (best[0][0] > threshold
+                                       or (best[0][0] == threshold and -best[0][1] < news_id)):
+                    return [(score, -neg_id) for score, neg_id in sorted(best, reverse=True)]
+        return [(score, -neg_id) for score, neg_id in sorted(best, reverse=True)]
+
+    @staticmethod
+    def below(score, news_id, after):
+        # Ranked strictly after the cursor (score desc, id asc)
+        last_score, last_id = after
+        return score < last_score or (score == last_score and news_id > last_id)
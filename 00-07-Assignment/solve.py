@@ -1,40 +1,83 @@
-from typing import Annotated, Literal
-from fastapi import FastAPI, Query, Path
+from typing import Annotated
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Path, Request, Response
 from pydantic import BaseModel, Field
+import asyncio
 import datetime
+import os
+import pathlib
+import sys
 
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))  # repo root, for the `shared` helpers
+from shared.cache import MISSING, TTLCache  # noqa: E402
+from shared.conditional import BOOT_ID, etag_matches, http_date, make_etag, not_modified, not_modified_since  # noqa: E402
+from shared.debug import debug_router  # noqa: E402
+from shared.instrumentation import instrument  # noqa: E402
+from shared.memory import MemoryTracker, deep_sizeof  # noqa: E402
+from shared.metrics import RouteMetrics  # noqa: E402
+from shared.pagination import decode_cursor, encode_cursor  # noqa: E402
+from shared.profiler import SamplingProfiler  # noqa: E402
+from shared.tracing import SlowRequestTracer  # noqa: E402
+from news_index import NewsIndex, to_epoch  # noqa: E402
+from news_search import tokenize  # noqa: E402
+from news_corpus import NewsCorpus  # noqa: E402
 
-dummy_data = [
-  {
-    "id": 1,
-    "title": "OpenAI launches GPT-4.5",
-    "category": "technology",
-    "media_house": "TechCrunch",
-    "updated_at": "2025-06-12T10:00:00",
-    "summary": "OpenAI has announced...",
-    "keywords": ["AI", "GPT", "OpenAI"]
-  },
-  {
-    "id": 2,
-    "title": "New advancements in quantum computing",
-    "category": "science",
-    "media_house": "Science Daily",
-    "updated_at": "2025-06-11T15:30:00",
-    "summary": "Researchers have made significant progress...",
-    "keywords": ["quantum", "computing", "research"]
-  },
- {
-    "id": 3,
-    "title": "Global economic outlook for 2025",
-    "category": "business",
-    "media_house": "Financial Times",
-    "updated_at": "2025-06-10T08:45:00",
-    "summary": "The global economy is expected to...",
-    }
-]
+
+class NewsArticle(BaseModel):
+    id: int
+    title: str
+    category: str
+    media_house: str
+    updated_at: datetime.datetime
+    summary: str
+    keywords: list[str] = []
+
+
+def create_store(articles):
+    # NEWS_STORE=columnar swaps the posting-list index for NumPy columns filtered with boolean masks
+    kind = os.environ.get('NEWS_STORE', 'index')
+    if kind == 'columnar':
+        from news_columnar import ColumnarNewsStore  # NumPy is only needed for this store
+        return ColumnarNewsStore(articles)
+    if kind == 'index':
+        return NewsIndex(articles)
+    raise ValueError(f"Unknown NEWS_STORE {kind!r}, expected 'index' or 'columnar'")
+
+
+# The corpus lives in an NDJSON file (one NewsArticle per line), loaded at import and watched for changes
+NEWS_CORPUS = os.environ.get('NEWS_CORPUS', str(pathlib.Path(__file__).with_name('news.ndjson')))
+NEWS_RELOAD_INTERVAL = float(os.environ.get('NEWS_RELOAD_INTERVAL', '1.0'))  # seconds; 0 disables the watcher
+
+news_store = create_store([])  # lookup structures, filled from the corpus file
+corpus = NewsCorpus(NEWS_CORPUS, NewsArticle, news_store, NEWS_RELOAD_INTERVAL)
+corpus.load()
+
+# GET /news results keyed by the canonical filter, dropped whenever news_store.version moves on
+news_cache = TTLCache(
+    maxsize=int(os.environ.get('NEWS_CACHE_SIZE', '1024')),
+    ttl=float(os.environ.get('NEWS_CACHE_TTL', '30')),
+)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    watcher = asyncio.create_task(corpus.watch()) if NEWS_RELOAD_INTERVAL > 0 else None
+    yield
+    if watcher is not None:
+        watcher.cancel()
 
 
-app = FastAPI(title="NewsAPI", description="A simple clone for NewsAPI", version="0.1.0")
+app = FastAPI(title="NewsAPI", description="A simple clone for NewsAPI", version="0.1.0", lifespan=lifespan)
+metrics = RouteMetrics()  # per route template: counts, in-flight, parse / handler / serialize latency histograms
+# Span breakdown of requests slower than TRACE_SLOW_MS or failing with a 5xx, appended to TRACE_FILE ('' = off)
+tracer = SlowRequestTracer(
+    threshold=float(os.environ.get('TRACE_SLOW_MS', '100')) / 1000,
+    capacity=int(os.environ.get('TRACE_BUFFER', '200')),
+    path=os.environ.get('TRACE_FILE', 'slow_requests.jsonl') or None,
+)
+memory = MemoryTracker()  # tracemalloc diagnostics, off until POST /debug/memory/start
+instrument(app, metrics, tracer, memory)  # must precede the routes: they are built with the instrumented route class
+profiler = SamplingProfiler()  # idle until /debug/profile is called
 
 class NewsFilterParams(BaseModel):
     model_config = {"extra": "forbid"}  # Forbid unknown/extra query params (useful in strict APIs)
@@ -45,30 +88,99 @@ class NewsFilterParams(BaseModel):
     keyword: str|None = None
     limit: int = Field(10, le=50)
     offset: int = Field(0, le=50)
+    q: str|None = None  # Full-text search over title and summary; results are ranked by relevance (BM25)
+    cursor: str|None = None  # Opaque token from the previous page's X-Next-Cursor header; resumes after its last id
+
+
+def parse_cursor(token, search):
+    # Cursor keys: the last id for plain listings, [score, id] for ranked search results
+    try:
+        key = decode_cursor(token)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if search:
+        valid = isinstance(key, list) and len(key) == 2 and isinstance(key[0], (int, float)) and isinstance(key[1], int)
+    else:
+        valid = isinstance(key, int)
+    if not valid:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor {token!r}")
+    return key
+
+
+def cache_key(news_filter, q, after):
+    # Equivalent queries share one entry: keyword case, datetime timezone and search-term order/case are normalized
+    return (
+        news_filter.media_house or None,
+        news_filter.category or None,
+        news_filter.keyword.lower() if news_filter.keyword else None,
+        to_epoch(news_filter.updated_after) if news_filter.updated_after else None,
+        None if q is None else ' '.join(sorted(set(tokenize(q)))),
+        tuple(after) if isinstance(after, list) else after,
+        news_filter.offset,
+        news_filter.limit,
+    )
 
 
 @app.get('/news')
-async def get_news(news_filter: Annotated[NewsFilterParams, Query()]): # annotated with Query to extract query parameters and not as request body
-    filtered_news = dummy_data
+async def get_news(news_filter: Annotated[NewsFilterParams, Query()], response: Response): # annotated with Query to extract query parameters and not as request body
+    q = news_filter.q or None
+    after = parse_cursor(news_filter.cursor, q is not None) if news_filter.cursor else None
+
+    key = cache_key(news_filter, q, after)
+    result = news_cache.get(key, news_store.version)
+    if result is MISSING:
+        result = news_store.query(
+            media_house=news_filter.media_house or None,
+            category=news_filter.category or None,
+            keyword=news_filter.keyword or None,
+            updated_after=news_filter.updated_after,
+            q=q,
+            after=after,
+            offset=news_filter.offset,
+            limit=news_filter.limit,
+        )
+        news_cache.set(key, result, news_store.version)
 
-    if news_filter.media_house:
-        filtered_news = [news for news in filtered_news if news['media_house'] == news_filter.media_house]
+    page, last_key = result
+    if page and len(page) == news_filter.limit:
+        response.headers['X-Next-Cursor'] = encode_cursor(last_key)
+    return page
 
-    if news_filter.category:
-        filtered_news = [news for news in filtered_news if news['category'] == news_filter.category]
 
-    if news_filter.updated_after:
-        filtered_news = [news for news in filtered_news if datetime.datetime.fromisoformat(news['updated_at']) > news_filter.updated_after]
+@app.get('/cache')
+async def get_cache_stats():
+    # Hit/miss/eviction counters for sizing NEWS_CACHE_SIZE and NEWS_CACHE_TTL
+    return news_cache.stats()
+
+
+@app.get('/corpus')
+async def get_corpus_status():
+    # Corpus file, article count and the most recent lines that failed validation
+    return corpus.status()
+
+
+def store_sizes():
+    # Entries and deep size in bytes of the long-lived in-memory structures
+    return {
+        'news_store': {'items': len(news_store), 'bytes': deep_sizeof(news_store)},
+        'news_cache': {'items': len(news_cache), 'bytes': deep_sizeof(news_cache)},
+    }
 
-    if news_filter.keyword:
-        filtered_news = [news for news in filtered_news if news_filter.keyword.lower() in list(map(str.lower, news.get('keywords', [])))]
 
-    return filtered_news[news_filter.offset:news_filter.offset + news_filter.limit]
+# /metrics and the token-guarded /debug/* routes (traces, profile, memory)
+app.include_router(debug_router(metrics, tracer, profiler, memory, store_sizes, app.router.route_class))
 
 
 @app.get('/news/{news_id}')
-async def get_news_by_id(news_id: Annotated[int, Path(ge=1)]):
-    for news in dummy_data:
-        if news['id'] == news_id:
-            return news
+async def get_news_by_id(news_id: Annotated[int, Path(ge=1)], request: Request, response: Response):
+    news = news_store.get(news_id)
+    if news is not None:
+        # Conditional GET: ETag from the article's store version, Last-Modified from its updated_at
+        etag = make_etag('news', BOOT_ID, news_id, news_store.article_version(news_id))
+        last_modified = to_epoch(news['updated_at'])
+        if etag_matches(request, etag) or not_modified_since(request, last_modified):
+            return not_modified(etag, last_modified)
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(last_modified)
+        return news
     return {"error": "News not found"}
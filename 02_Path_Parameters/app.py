@@ -1,9 +1,15 @@
 # Chapter 2 → Path Parameters
 # Covers how to use dynamic values in URLs, and how to validate and restrict them.
 
-from fastapi import FastAPI # type: ignore
+import os
+import pathlib
+import sys
+from fastapi import FastAPI, Request # type: ignore
 from enum import Enum
 
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))  # repo root, for the `shared` helpers
+from file_server import from_env  # noqa: E402
+
 app = FastAPI()
 
 # ───────────────────────────────────────────────
@@ -87,8 +93,28 @@ async def get_model(item_id: ItemID):
 # ✅ Path Parameters That Contain Paths
 # ───────────────────────────────────────────────
 
+files = from_env(pathlib.Path(__file__).with_name("files"))  # root directory: FILES_ROOT, default ./files
+
 @app.get("/files/{file_path:path}")
-async def read_file(file_path: str):
-    return {"file_path": file_path}
+@app.head("/files/{file_path:path}", include_in_schema=False)  # same handler: headers only, no body
+async def read_file(file_path: str, request: Request):
+    return await files.serve(request, file_path)
     # `:path` makes the parameter accept slashes
-    # Example: GET /files/folder/subfolder/file.txt → {"file_path": "folder/subfolder/file.txt"}
+    # Example: GET /files/docs/hello.txt → the contents of files/docs/hello.txt
+    # GET /files/../app.py (or any path that resolves outside the root) → 404
+    # Range: bytes=0-99 → 206 Partial Content; If-None-Match with the returned ETag → 304 Not Modified
+    # See file_server.py for the small-file cache and zero-copy sending of large files
+
+
+# ───────────────────────────────────────────────
+# ⚡ Radix-Tree Routing (opt-in: RADIX_ROUTER=1)
+# ───────────────────────────────────────────────
+# By default every request is checked against each route's regex in declaration order, which is why
+# /users/me has to come first above. With RADIX_ROUTER=1 requests are matched through a tree of path
+# segments instead: static segments beat {params}, which beat {name:path}, whatever the declaration order.
+# Typed params still 422 and unknown paths still 404 exactly as before.
+
+if os.environ.get("RADIX_ROUTER") == "1":
+    from shared.radix_router import install_radix_router
+
+    install_radix_router(app)
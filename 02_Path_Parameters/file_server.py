@@ -0,0 +1,173 @@
+# File server → files under one root directory, for the /files/{file_path:path} route
+# - Paths are resolved (symlinks included) and anything that lands outside the root is a 404
+# - ETag / Last-Modified come from os.stat, so If-None-Match / If-Modified-Since revalidations are a 304 with
+#   no file read at all (shared/conditional.py does the header checks)
+# - Range requests (single, multiple, If-Range) → 206 / 416, handled by Starlette's FileResponse
+# - Small files are kept in a bounded LRU cache and served from memory, checked against mtime + size each time
+# - Large files are handed to the server to send itself when it offers an ASGI zero-copy extension:
+#   http.response.pathsend for whole files, http.response.zerocopysend (os.sendfile on the socket) for whole
+#   files and ranges. Otherwise they are streamed in 64 KiB chunks from the threadpool.
+#   An ASGI app never sees the socket, so it cannot call os.sendfile itself.
+
+import collections
+import contextlib
+import os
+import pathlib
+import stat
+import threading
+
+from fastapi import HTTPException # type: ignore
+from fastapi.concurrency import run_in_threadpool # type: ignore
+from starlette.responses import FileResponse # type: ignore
+
+# app.py puts the repo root on sys.path
+from shared.conditional import etag_matches, http_date, make_etag, not_modified, not_modified_since
+
+
+ZEROCOPY = 'http.response.zerocopysend'
+
+
+def stat_etag(st):
+    return make_etag(f'{st.st_mtime_ns:x}', f'{st.st_size:x}')
+
+
+class ZeroCopyFileResponse(FileResponse):
+    # FileResponse that uses the server's zero-copy send when it advertises one
+    zerocopy = False
+
+    async def __call__(self, scope, receive, send):
+        self.zerocopy = ZEROCOPY in scope.get('extensions', {})
+        await super().__call__(scope, receive, send)
+
+    async def _send_zerocopy(self, send, offset, count):
+        with open(self.path, 'rb') as file:
+            await send({'type': ZEROCOPY, 'file': file, 'offset': offset, 'count': count, 'more_body': False})
+
+    async def _handle_simple(self, send, send_header_only, send_pathsend):
+        if not self.zerocopy or send_header_only or send_pathsend:
+            return await super()._handle_simple(send, send_header_only, send_pathsend)
+        await send({'type': 'http.response.start', 'status': self.status_code, 'headers': self.raw_headers})
+        await self._send_zerocopy(send, 0, self.stat_result.st_size)
+
+    async def _handle_single_range(self, send, start, end, file_size, send_header_only):
+        if not self.zerocopy or send_header_only:
+            return await super()._handle_single_range(send, start, end, file_size, send_header_only)
+        headers = self.headers.mutablecopy()
+        headers['content-range'] = f'bytes {start}-{end - 1}/{file_size}'
+        headers['content-length'] = str(end - start)
+        await send({'type': 'http.response.start', 'status': 206, 'headers': headers.raw})
+        await self._send_zerocopy(send, start, end - start)
+
+
+class MemoryFile:
+    # The part of anyio's AsyncFile that FileResponse reads with
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    async def seek(self, position):
+        self.position = position
+
+    async def read(self, size):
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+class CachedFileResponse(FileResponse):
+    # FileResponse over bytes already in memory: same headers and range handling, no file I/O
+    def __init__(self, data, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self.data = data
+        self.chunk_size = max(len(data), 1)
+
+    async def __call__(self, scope, receive, send):
+        scope = {**scope, 'extensions': {k: v for k, v in scope.get('extensions', {}).items()
+                                          if k != 'http.response.pathsend'}}
+        await super().__call__(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def _open_file(self):
+        yield MemoryFile(self.data)
+
+
+class FileCache:
+    # LRU of small files, bounded by total bytes: path → (mtime_ns, size, data)
+    def __init__(self, max_bytes, max_file_bytes):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.size = 0
+        self._files = collections.OrderedDict()
+        self._lock = threading.Lock()  # filled from threadpool workers
+
+    def get(self, path, st):
+        if st.st_size > self.max_file_bytes:
+            return None
+        key = str(path)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+                self._files.move_to_end(key)
+                return entry[2]
+        data = path.read_bytes()
+        if len(data) != st.st_size:
+            return None  # changed while we read it; serve from disk this time
+        with self._lock:
+            old = self._files.pop(key, None)
+            if old is not None:
+                self.size -= len(old[2])
+            self._files[key] = (st.st_mtime_ns, st.st_size, data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self._files.popitem(last=False)
+                self.size -= len(evicted)
+        return data
+
+
+class FileServer:
+    def __init__(self, root, cache_bytes=32 * 1024 * 1024, cache_file_bytes=256 * 1024):
+        self.root = pathlib.Path(root).resolve()
+        self.cache = FileCache(cache_bytes, cache_file_bytes)
+
+    def resolve(self, file_path):
+        # Absolute path of a regular file under the root, with its stat, or None
+        if '\x00' in file_path:
+            return None
+        path = (self.root / file_path).resolve()
+        if not path.is_relative_to(self.root):
+            return None  # ../ segments, absolute paths, symlinks pointing outside the root
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return path, st
+
+    def lookup(self, file_path):
+        found = self.resolve(file_path)
+        if found is None:
+            return None
+        path, st = found
+        return path, st, self.cache.get(path, st)
+
+    async def serve(self, request, file_path):
+        found = await run_in_threadpool(self.lookup, file_path)
+        if found is None:
+            raise HTTPException(status_code=404, detail='File not found')
+        path, st, data = found
+        etag = stat_etag(st)
+        if etag_matches(request, etag) or not_modified_since(request, st.st_mtime):
+            return not_modified(etag, st.st_mtime)
+        headers = {'etag': etag, 'last-modified': http_date(st.st_mtime)}
+        if data is not None:
+            return CachedFileResponse(data, path, headers=headers, stat_result=st)
+        return ZeroCopyFileResponse(path, headers=headers, stat_result=st)
+
+
+def from_env(default_root):
+    return FileServer(
+        os.environ.get('FILES_ROOT', default_root),
+        cache_bytes=int(os.environ.get('FILES_CACHE_MB', '32')) * 1024 * 1024,
+        cache_file_bytes=int(os.environ.get('FILES_CACHE_FILE_KB', '256')) * 1024,
+    )
@@ -2,9 +2,14 @@
 # Explains how to receive and validate request body data in FastAPI using Pydantic models.
 # A request body is data sent by the client to your API. A response body is the data your API sends to the client.
 
+import pathlib
+import sys
 from fastapi import FastAPI
 from pydantic import BaseModel
 
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))  # repo root, for the `shared` helpers
+from shared.json_route import JSONBodyRoute  # noqa: E402
+
 # ───────────────────────────────────────────────
 # ✅ Declare the Request Body using Pydantic
 # ───────────────────────────────────────────────
@@ -19,6 +24,7 @@ class Item(BaseModel):
 # When a field has a default value (or is set to None), it becomes optional
 
 app = FastAPI()
+app.router.route_class = JSONBodyRoute  # ⚡ model bodies validated straight from the raw bytes (shared/json_route.py)
 
 
 # ───────────────────────────────────────────────
@@ -57,7 +63,7 @@ async def update_item(item_id: int, item: Item, q: str | None = None):
     # item_id → taken from the URL path
     # item → parsed from request body
     # q → optional query parameter
-    result = {"item_id": item_id, **item.dict()}
+    result = {"item_id": item_id, **item.model_dump()}
     if q:
         result.update({"q": q})
     return result
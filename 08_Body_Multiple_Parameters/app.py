@@ -2,11 +2,17 @@
 # Learn how to combine Path, Query, and Body parameters effectively in FastAPI,
 # and how FastAPI handles multiple body inputs.
 
+import pathlib
+import sys
 from typing import Annotated
 from fastapi import FastAPI, Path, Body
 from pydantic import BaseModel
 
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))  # repo root, for the `shared` helpers
+from shared.json_route import JSONBodyRoute  # noqa: E402
+
 app = FastAPI()
+app.router.route_class = JSONBodyRoute  # ⚡ model bodies validated straight from the raw bytes (shared/json_route.py)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 📦 Defining a Pydantic model for item
@@ -1,10 +1,19 @@
 # 📚 Chapter 10: Body - Nested Models
 # FastAPI, powered by Pydantic, supports deeply nested and structured data using models, sets, lists, and even type-enforced dictionaries.
 
-from fastapi import FastAPI
+import pathlib
+import sys
+from typing import Annotated, Literal
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
 from pydantic import BaseModel, HttpUrl
 
+from weight_vectors import DECODERS, JSON, NPY, RAW, WeightStore, WeightsError, encode, negotiate, parse_stream
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))  # repo root, for the `shared` helpers
+from shared.json_route import JSONBodyRoute  # noqa: E402
+
 app = FastAPI()
+app.router.route_class = JSONBodyRoute  # ⚡ model bodies validated straight from the raw bytes (shared/json_route.py)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 🧺 List & Set Fields in Models
@@ -87,9 +96,76 @@ async def update_item(item_id: int, item: ItemHttp):
 # ─────────────────────────────────────────────────────────────────────────────
 # 🧩 Arbitrary Dictionary Bodies
 
-@app.post("/index-weights/")
-async def create_index_weights(weights: dict[int, float]):
-    return weights
+weight_store = WeightStore()
+
+# The body is read as a stream instead of a `weights: dict[int, float]` parameter, so the schema is given by hand
+WEIGHTS_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "propertyNames": {"pattern": "^-?[0-9]+$"},
+                    "additionalProperties": {"type": "number"},
+                },
+            },
+            "application/x-npy": {"schema": {"type": "string", "format": "binary"}},
+            "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+        },
+    },
+}
+
+def get_vector(vector_id: int):
+    vector = weight_store.get(vector_id)
+    if vector is None:
+        raise HTTPException(status_code=404, detail="Weight vector not found")
+    return vector
+
+@app.post("/index-weights/", openapi_extra=WEIGHTS_BODY)
+async def create_index_weights(request: Request):
+    media_type = request.headers.get("content-type", JSON).partition(";")[0].strip().lower()
+    if media_type != JSON and media_type not in DECODERS:
+        raise HTTPException(status_code=415, detail=f"Send {JSON}, {NPY} or {RAW}")
+    try:
+        if media_type == JSON:
+            vector = await parse_stream(request.stream())
+        else:
+            vector = DECODERS[media_type](await request.body())
+    except WeightsError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"id": weight_store.add(vector), **vector.summary()}
+    # → {"id": 1, "entries": 3, "sum": 1.0, "min": 0.25, "max": 0.5, "l2_norm": 0.61…, "top": [[2, 0.5], …], …}
+    # A summary instead of the whole mapping echoed back: with millions of entries that echo was most of the work
+
+@app.get("/index-weights/{vector_id}")
+async def read_index_weights(vector_id: int, top: Annotated[int, Query(ge=0, le=1000)] = 5):
+    return {"id": vector_id, **get_vector(vector_id).summary(top)}
+
+@app.get("/index-weights/{vector_id}/weights", responses={
+    200: {"content": {NPY: {}, RAW: {}}, "description": "The whole vector, in the format asked for by `Accept`"},
+})
+async def export_index_weights(vector_id: int, accept: Annotated[str | None, Header()] = None):
+    vector = get_vector(vector_id)
+    media_type = negotiate(accept)
+    if media_type is None:
+        raise HTTPException(status_code=406, detail=f"Available as {JSON}, {NPY} or {RAW}")
+    return Response(encode(vector, media_type), media_type=media_type)
+    # Accept: application/json → {"1": 0.25, …}; application/x-npy → np.load()-able; application/octet-stream → the
+    # bare records, sorted by key
+
+@app.get("/index-weights/{vector_id}/top")
+async def top_index_weights(vector_id: int, k: Annotated[int, Query(ge=1, le=10_000)] = 10):
+    return {"id": vector_id, "top": get_vector(vector_id).top(k)}
+
+@app.post("/index-weights/{vector_id}/normalize")
+async def normalize_index_weights(vector_id: int, norm: Literal["l1", "l2", "max"] = "l2"):
+    weight_store.replace(vector_id, get_vector(vector_id).normalized(norm))
+    return {"id": vector_id, **weight_store.get(vector_id).summary()}
+
+@app.get("/index-weights/{vector_id}/dot/{other_id}")
+async def dot_index_weights(vector_id: int, other_id: int):
+    return {"id": vector_id, "other_id": other_id, "dot": get_vector(vector_id).dot(get_vector(other_id))}
 
 # 🧾 Expected request body:
 # A JSON object where:
@@ -107,6 +183,18 @@ async def create_index_weights(weights: dict[int, float]):
 # 🔍 Important:
 # Even though keys are defined as `int` in Python, JSON requires object keys to be strings.
 # FastAPI will **automatically parse** keys like `"1"` into integers if defined as `dict[int, float]`.
+# ⚡ /index-weights/ parses them itself instead (see weight_vectors.py): the body is scanned as it streams in and
+# stored as int64 / float64 NumPy arrays, 16 bytes per entry. Keys and values are converted with the same lax
+# rules as `dict[int, float]` ("\u0031", " 1", "1.0" keys; "0.5" or true values), a repeated key keeps its last
+# value. Narrower than `dict[int, float]` on purpose: keys must fit in int64 and values must be finite
+# (1e400 → 422, where the dict accepted inf). Anything else → 422.
+
+# 📦 Binary bodies: JSON spends ~20-30 bytes and a number parse per entry. With `Content-Type: application/x-npy`
+# (an np.save'd array of (key int64, value float64) records) or `application/octet-stream` (the same records back
+# to back, 16 bytes each, little-endian) the body is used as the arrays directly, no parsing at all.
+# Keys must be unique there and values finite, checked over the whole array at once → 422 otherwise.
+#   records = np.array([(1, 0.25), (2, 0.5)], dtype=[("key", "<i8"), ("value", "<f8")])
+#   httpx.post(url, content=records.tobytes(), headers={"content-type": "application/octet-stream"})
 
 # ─────────────────────────────────────────────────────────────────────────────
  
\ No newline at end of file
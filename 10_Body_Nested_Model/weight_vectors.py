@@ -0,0 +1,310 @@
+# Weight vectors → dict[int, float] bodies parsed straight into int64 / float64 NumPy arrays
+# `weights: dict[int, float]` makes FastAPI read the whole body, build a dict of Python ints and floats (~100+
+# bytes per entry) and have Pydantic check it entry by entry. Here the JSON object is scanned chunk by chunk as
+# it arrives, each chunk's pairs are converted to arrays in bulk, and only the arrays (16 bytes per entry) are kept.
+# Keys are sorted and unique (a repeated key keeps its last value, like a dict), which makes the vector
+# operations below plain NumPy calls.
+# The same vectors also travel as binary: application/x-npy (np.save of RECORD) or application/octet-stream
+# (the bare records). Both are read with np.frombuffer, i.e. as views over the request body, not copies.
+
+import io
+import itertools
+import json
+import re
+import threading
+
+import numpy as np
+from pydantic import TypeAdapter # type: ignore
+
+
+# One `"key": number` pair plus the `,` or `}` after it, so a pair cut by a chunk boundary never matches early
+NUMBER = rb'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?'
+PAIR = re.compile(rb'\s*"(-?\d+)"\s*:\s*(%s)\s*([,}])' % NUMBER)
+# Any other string key with a string, number or boolean value ("\u0031", " 1", "1.0": "0.5", "2": true), which
+# `dict[int, float]` also accepts. Much rarer, so it is only tried where PAIR does not match
+STRING = rb'"(?:[^"\\\x00-\x1f]|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*"'
+STRING_START = rb'"(?:[^"\\\x00-\x1f]|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*(?:\\(?:u[0-9a-fA-F]{0,3})?)?'
+LAX_PAIR = re.compile(rb'\s*(%s)\s*:\s*(%s|%s|true|false)\s*([,}])' % (STRING, STRING, NUMBER))
+# What a pair cut short can look like
+PARTIAL = re.compile(rb'\s*(?:%s|%s\s*(?::\s*(?:[-+.\deE]*|%s|%s|t(?:r(?:ue?)?)?|f(?:a(?:l(?:se?)?)?)?)\s*)?)?'
+                     % (STRING_START, STRING, STRING, STRING_START))
+OPEN = re.compile(rb'\s*\{')
+MAX_PAIR_BYTES = 1024  # a longer unmatched stretch is malformed, not just incomplete
+
+JSON, NPY, RAW = 'application/json', 'application/x-npy', 'application/octet-stream'
+RECORD = np.dtype([('key', '<i8'), ('value', '<f8')])  # 16 bytes per entry, little-endian, no padding
+KEY, VALUE = TypeAdapter(int), TypeAdapter(float)  # the lax rules dict[int, float] applies to keys and values
+
+
+class WeightsError(ValueError):
+    pass
+
+
+class WeightsParser:
+    def __init__(self):
+        self.buffer = b''
+        self.offset = 0      # bytes of the body before self.buffer, for error positions
+        self.state = 'open'  # open → pairs → closed
+        self.pairs = 0
+        self.keys = []       # one int64 array per chunk
+        self.values = []     # one float64 array per chunk
+
+    def error(self, message, pos):
+        raise WeightsError(f'{message} at byte {self.offset + pos}')
+
+    def feed(self, chunk, final=False):
+        buffer = self.buffer + chunk
+        pos = 0
+        if self.state == 'open':
+            match = OPEN.match(buffer)
+            if match is None:
+                if buffer.strip():
+                    self.error('Expected a JSON object', len(buffer) - len(buffer.lstrip()))
+                pos = len(buffer)
+            else:
+                pos = match.end()
+                self.state = 'pairs'
+        if self.state == 'pairs' and self.pairs == 0 and buffer[pos:].lstrip().startswith(b'}'):
+            self.state = 'closed'  # {}
+            pos = buffer.index(b'}', pos) + 1
+        if self.state == 'pairs':
+            keys, values = [], []
+            match = PAIR.match(buffer, pos) or LAX_PAIR.match(buffer, pos)
+            while match is not None:
+                if match.re is PAIR:
+                    keys.append(match[1])
+                    values.append(match[2])
+                else:
+                    key, value = self.coerce(match, pos)
+                    keys.append(key)
+                    values.append(value)
+                pos = match.end()
+                if match[3] == b'}':
+                    self.state = 'closed'
+                    break
+                match = PAIR.match(buffer, pos) or LAX_PAIR.match(buffer, pos)
+            if keys:
+                self.pairs += len(keys)
+                self.convert(keys, values, pos)
+            if self.state == 'pairs' and (final or len(buffer) - pos > MAX_PAIR_BYTES
+                                          or not PARTIAL.fullmatch(buffer, pos)):
+                self.error('Expected "<integer>": <number>', pos)
+        if self.state == 'closed' and buffer[pos:].strip():
+            self.error('Unexpected data after the object', pos)
+        if final and self.state != 'closed':
+            self.error('Unexpected end of body', len(buffer))
+        self.offset += pos
+        self.buffer = buffer[pos:] if self.state != 'closed' else b''
+
+    def coerce(self, match, pos):
+        # A LAX_PAIR: decoded as JSON, converted like FastAPI + Pydantic would, then written back in the plain
+        # form PAIR captures so convert() sees one kind of input
+        try:
+            key = KEY.validate_python(json.loads(match[1]))
+            value = VALUE.validate_python(json.loads(match[2]))
+        except ValueError:  # json.JSONDecodeError and pydantic.ValidationError
+            self.error('Expected "<integer>": <number>', pos)
+        return str(key).encode(), repr(value).encode()
+
+    def convert(self, keys, values, pos):
+        try:
+            keys = np.array(keys).astype(np.int64)
+        except OverflowError:
+            self.error('Key out of int64 range', pos)
+        values = np.array(values).astype(np.float64)
+        if not np.isfinite(values).all():
+            self.error('Value out of float64 range', pos)
+        self.keys.append(keys)
+        self.values.append(values)
+
+    def result(self):
+        keys = np.concatenate(self.keys) if self.keys else np.empty(0, np.int64)
+        values = np.concatenate(self.values) if self.values else np.empty(0, np.float64)
+        return WeightVector.from_pairs(keys, values)
+
+
+async def parse_stream(chunks):
+    # WeightVector from an async iterable of body chunks, e.g. request.stream()
+    parser = WeightsParser()
+    async for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+    parser.feed(b'', final=True)
+    return parser.result()
+
+
+class WeightVector:
+    __slots__ = ('keys', 'values')
+
+    def __init__(self, keys, values):
+        self.keys = keys      # int64, sorted, unique
+        self.values = values  # float64, same length
+
+    @classmethod
+    def from_pairs(cls, keys, values):
+        # Sort by key; when a key repeats, the last occurrence wins
+        order = np.argsort(keys, kind='stable')
+        keys, values = keys[order], values[order]
+        last = np.ones(len(keys), dtype=bool)
+        last[:-1] = keys[1:] != keys[:-1]
+        return cls(keys[last], values[last])
+
+    @classmethod
+    def from_unique(cls, keys, values):
+        # Validated in bulk. Binary bodies have no "last one wins" convention, so a repeated key is an error.
+        # Already-sorted keys (what records() and most writers produce) are kept as they are, without a copy
+        if not np.isfinite(values).all():
+            raise WeightsError('Values must be finite')
+        if len(keys) > 1 and not (keys[1:] > keys[:-1]).all():
+            order = np.argsort(keys, kind='stable')
+            keys, values = keys[order], values[order]
+            repeated = keys[1:] == keys[:-1]
+            if repeated.any():
+                raise WeightsError(f'Duplicate key {keys[1:][repeated][0]}')
+        return cls(keys, values)
+
+    def records(self):
+        records = np.empty(len(self), RECORD)
+        records['key'] = self.keys
+        records['value'] = self.values
+        return records
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.values.nbytes
+
+    def total(self):
+        return float(self.values.sum())
+
+    def norm(self, kind='l2'):
+        if kind == 'l1':
+            return float(np.abs(self.values).sum())
+        if kind == 'max':
+            return float(np.abs(self.values).max(initial=0.0))
+        return float(np.sqrt(np.dot(self.values, self.values)))
+
+    def normalized(self, kind='l2'):
+        norm = self.norm(kind)
+        return WeightVector(self.keys, self.values / norm if norm else self.values.copy())
+
+    def top(self, k):
+        # The k largest weights as [[key, weight], ...], largest first
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        part = np.argpartition(self.values, len(self) - k)[len(self) - k:]
+        best = part[np.lexsort((self.keys[part], -self.values[part]))]  # ties → smaller key first
+        return [[int(key), float(value)] for key, value in zip(self.keys[best], self.values[best])]
+
+    def dot(self, other):
+        # Sparse dot product: only keys present in both vectors contribute
+        _, mine, theirs = np.intersect1d(self.keys, other.keys, assume_unique=True, return_indices=True)
+        return float(np.dot(self.values[mine], other.values[theirs]))
+
+    def summary(self, top=5):
+        empty = len(self) == 0
+        return {
+            'entries': len(self),
+            'sum': self.total(),
+            'min': None if empty else float(self.values.min()),
+            'max': None if empty else float(self.values.max()),
+            'l2_norm': self.norm('l2'),
+            'min_key': None if empty else int(self.keys[0]),
+            'max_key': None if empty else int(self.keys[-1]),
+            'top': self.top(top),
+            'bytes': self.nbytes,
+        }
+
+
+def from_raw(body):
+    if len(body) % RECORD.itemsize:
+        raise WeightsError(f'Body is {len(body)} bytes, not a whole number of {RECORD.itemsize}-byte records')
+    records = np.frombuffer(body, RECORD)
+    return WeightVector.from_unique(records['key'], records['value'])
+
+
+def from_npy(body):
+    # A 1-d structured array with an integer `key` and a float `value` field, e.g. np.save(f, vector.records())
+    stream = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(stream)
+        read_header = {(1, 0): np.lib.format.read_array_header_1_0,
+                       (2, 0): np.lib.format.read_array_header_2_0}[version]
+        shape, _, dtype = read_header(stream)
+    except (KeyError, ValueError) as e:
+        raise WeightsError(f'Not a .npy file this endpoint reads: {e}')
+    names = dtype.names or ()
+    if len(shape) != 1 or 'key' not in names or 'value' not in names \
+            or dtype['key'].kind not in 'iu' or dtype['value'].kind not in 'iuf':
+        raise WeightsError(f'Expected a 1-d array of (key: integer, value: float) records, got {dtype} {shape}')
+    if len(body) - stream.tell() != shape[0] * dtype.itemsize:
+        raise WeightsError(f'Expected {shape[0]} records of {dtype.itemsize} bytes after the header')
+    records = np.frombuffer(body, dtype, count=shape[0], offset=stream.tell())
+    keys = records['key']
+    if keys.dtype.kind == 'u' and len(keys) and keys.max() > np.iinfo(np.int64).max:
+        raise WeightsError('Key out of int64 range')
+    # Only a non-native or narrower field is converted; the RECORD layout stays a view over the body
+    values = records['value'].astype(np.float64, copy=False)
+    return WeightVector.from_unique(keys.astype(np.int64, copy=False), values)
+
+
+DECODERS = {NPY: from_npy, RAW: from_raw}
+
+
+def encode(vector, media_type):
+    if media_type == RAW:
+        return vector.records().tobytes()
+    if media_type == NPY:
+        stream = io.BytesIO()
+        np.save(stream, vector.records(), allow_pickle=False)
+        return stream.getvalue()
+    return json.dumps(dict(zip(map(str, vector.keys.tolist()), vector.values.tolist()))).encode()
+
+
+def negotiate(accept, offered=(JSON, NPY, RAW)):
+    # The offered media type the Accept header prefers (the first one for */* or no header), None if none fits
+    if not accept:
+        return offered[0]
+    best, best_rank = None, (0.0, False)
+    for part in accept.split(','):
+        media_type, *params = [piece.strip().lower() for piece in part.split(';')]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in offered:
+            rank = (q, True)
+        elif media_type in ('*/*', 'application/*'):
+            rank, media_type = (q, False), offered[0]
+        else:
+            continue
+        if q > 0 and rank > best_rank:
+            best, best_rank = media_type, rank
+    return best
+
+
+class WeightStore:
+    # In-memory vectors by id; vectors are never modified in place, so readers need no lock
+    def __init__(self):
+        self.vectors = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, vector):
+        with self._lock:
+            vector_id = next(self._ids)
+        self.vectors[vector_id] = vector
+        return vector_id
+
+    def get(self, vector_id):
+        return self.vectors.get(vector_id)
+
+    def replace(self, vector_id, vector):
+        self.vectors[vector_id] = vector
@@ -1,10 +1,16 @@
 # 📘 Chapter 11: Declare Request Example Data
 # FastAPI allows you to document example request bodies to improve your OpenAPI docs and help users understand what kind of data to send.
 
+import os
+import pathlib
+import sys
+import time
 from typing import Annotated
 from fastapi import FastAPI, Body
 from pydantic import BaseModel, Field
 
+STARTED = time.perf_counter()  # ⏱️ start of the module body, for the warm-up report at the bottom
+
 app = FastAPI()
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -130,3 +136,15 @@ async def update_item(
 # 🔥 Swagger UI renders these examples more cleanly than plain `examples=[]`.
 
 # ─────────────────────────────────────────────────────────────────────────────
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ⚡ Startup Warm-up (opt-in: WARMUP=1)
+# All those examples make this schema slow to generate, and FastAPI only builds it on the first /docs or
+# /openapi.json hit, i.e. right after a deploy. With WARMUP=1 it is built at startup instead, or loaded from a
+# content-hashed cache in .openapi_cache/, and the timings (including the first request's) are logged.
+
+if os.environ.get("WARMUP") == "1":
+    sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))  # repo root, for the `shared` helpers
+    from shared.warmup import warm_up
+
+    warm_up(app, cache_dir=pathlib.Path(__file__).with_name(".openapi_cache"), import_started=STARTED)
@@ -0,0 +1,117 @@
+# Benchmark → POST /products/bulk's ingest loop (00-04-Assignment/bulk_ingest.py): rows/s and peak memory
+# Run from the repo root: python benchmarks/bench_bulk_ingest.py [--rows 200000] [--chunk-kb 64]
+# The body is fed as network-sized chunks into ingest_ndjson, whose batches are numbered and dropped so the
+# store's own growth stays out of the numbers. Peak memory (tracemalloc, allocated after the body was built)
+# should track one batch and one line, not the body: the "huge line" row sends a
+# single line many times MAX_LINE_BYTES long, which has to come back as one error row.
+# Before timing, the edge cases the endpoint promises are checked: malformed lines become error rows without
+# stopping the upload, a disconnect still inserts the rows validated so far, a failed insert is not retried.
+
+import argparse
+import asyncio
+import json
+import pathlib
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / '00-04-Assignment'))
+
+import datagen  # noqa: E402
+from bulk_ingest import MAX_LINE_BYTES, ingest_ndjson  # noqa: E402
+from solve import Product  # noqa: E402
+from starlette.requests import ClientDisconnect  # noqa: E402
+
+
+async def chunked(body, size):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+async def disconnecting(*parts):
+    for part in parts:
+        yield part
+    raise ClientDisconnect()
+
+
+def recorder(inserted, fail=False):
+    async def insert_batch(batch):
+        inserted.append([row.name for row in batch])
+        if fail:
+            raise RuntimeError('insert failed')
+        return [(row, True) for row in batch]
+    return insert_batch
+
+
+async def results(stream):
+    return [json.loads(row) async for row in stream]
+
+
+async def check_edge_cases():
+    a, b, c = (json.dumps({'name': name, 'price': 1}).encode() for name in 'abc')
+
+    inserted = []
+    body = b'\n'.join([a, b'{not json\xff', b, b'x' * (MAX_LINE_BYTES + 10), c]) + b'\n'
+    rows = await results(ingest_ndjson(chunked(body, 4096), Product, recorder(inserted)))
+    assert [(r['line'], r['status']) for r in rows] == [
+        (2, 'error'), (4, 'error'), (1, 'created'), (3, 'created'), (5, 'created')], rows
+    assert rows[1]['errors'][0]['type'] == 'line_too_long', rows[1]
+    assert inserted == [['a', 'b', 'c']], inserted
+
+    inserted = []
+    stream = ingest_ndjson(disconnecting(a + b'\n' + b + b'\n'), Product, recorder(inserted))
+    try:
+        await results(stream)
+    except ClientDisconnect:
+        pass
+    assert inserted == [['a', 'b']], inserted
+
+    inserted = []
+    stream = ingest_ndjson(chunked(a + b'\n' + b + b'\n', 4096), Product, recorder(inserted, fail=True))
+    try:
+        await results(stream)
+    except RuntimeError:
+        pass
+    assert inserted == [['a', 'b']], inserted  # tried once, not again on the way out
+
+
+async def ingest(body, chunk_size):
+    stored = 0
+
+    async def insert_batch(batch):
+        nonlocal stored
+        for row in batch:
+            stored += 1
+            row.id = stored
+        return [(row, True) for row in batch]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = 0
+    async for _ in ingest_ndjson(chunked(body, chunk_size), Product, insert_batch):
+        count += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak, stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NDJSON bulk ingest throughput and memory')
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--chunk-kb', type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(check_edge_cases())
+    print('edge cases: ok')
+
+    products = b''.join(json.dumps(datagen.make_product(i)).encode() + b'\n' for i in range(args.rows))
+    huge = b'{"name": "' + b'x' * (20 * MAX_LINE_BYTES) + b'", "price": 1}\n'
+    print(f'{"body":<12} {"MB":>8} {"rows/s":>10} {"peak MB":>9} {"stored":>8}')
+    for name, body in (('products', products), ('huge line', huge)):
+        count, elapsed, peak, stored = asyncio.run(ingest(body, args.chunk_kb * 1024))
+        print(f'{name:<12} {len(body) / 1e6:>8.1f} {count / elapsed:>10.0f} {peak / 1e6:>9.1f} {stored:>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# Benchmark → serializing a 100-item GET /products page: FastAPI encoding vs cached JSON fragments
+# Run from the repo root: python benchmarks/bench_fragments.py [--page 100 --reviews 5]
+# "fastapi" is what the route did before: jsonable_encoder over the dict of Products, then JSONResponse.render.
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / '00-04-Assignment'))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from fragments import FragmentCache  # noqa: E402
+from solve import Product, Review  # noqa: E402
+
+
+def make_page(size, reviews):
+    return [
+        Product(
+            id=i, name=f'Product {i}', description=f'Description of product {i}', price=9.99 + i, in_stock=i % 7,
+            reviews=[Review(reviewer=f'user{j}', rating=j % 5, comment=f'Review {j} of product {i}') for j in range(reviews)]
+        )
+        for i in range(1, size + 1)
+    ]
+
+
+def fastapi_path(page):
+    return JSONResponse(jsonable_encoder({'products': page, 'next_cursor': 'MTAw'})).body
+
+
+def fragment_path(page, cache, versions):
+    body = b','.join(cache.get(p, versions[p.id]) for p in page)
+    return b'{"products":[' + body + b'],"next_cursor":' + json.dumps('MTAw').encode() + b'}'
+
+
+def per_call_us(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Product page serialization benchmark')
+    parser.add_argument('--page', type=int, default=100)
+    parser.add_argument('--reviews', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    page = make_page(args.page, args.reviews)
+    versions = {p.id: 1 for p in page}
+    cache = FragmentCache()
+    assert json.loads(fastapi_path(page)) == json.loads(fragment_path(page, cache, versions))
+
+    fastapi_us = per_call_us(lambda: fastapi_path(page), args.repeat)
+    cold_us = per_call_us(lambda: fragment_path(page, FragmentCache(), versions), args.repeat)
+    warm_us = per_call_us(lambda: fragment_path(page, cache, versions), args.repeat)
+    print(f'{args.page} products x {args.reviews} reviews, µs per page')
+    print(f'  jsonable_encoder + JSONResponse : {fastapi_us:10.1f}')
+    print(f'  fragments, cold cache           : {cold_us:10.1f}')
+    print(f'  fragments, warm cache           : {warm_us:10.1f}   ({fastapi_us / warm_us:.0f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Benchmark → req/s for nested model bodies with FastAPI's default route vs shared/json_route.py's JSONBodyRoute
+# Run from the repo root: python benchmarks/bench_json_route.py [--requests 3000] [--repeat 3]
+# Both apps declare chapter 10's PUT /items_nested/{item_id} and /items_http/{item_id} with the same models and
+# handlers; only the route class differs. In-process (ASGI transport), so the numbers are framework + Pydantic.
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+
+import httpx # type: ignore
+from fastapi import FastAPI # type: ignore
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from shared.apps import load_module  # noqa: E402
+from shared.json_route import JSONBodyRoute  # noqa: E402
+
+
+NESTED = {
+    'name': 'Foo', 'description': 'The pretender', 'price': 42.0, 'tax': 3.2,
+    'tags': ['rock', 'metal', 'bar'],
+    'image': {'url': 'http://example.com/baz.jpg', 'name': 'The Foo live'},
+}
+MANY_TAGS = {**NESTED, 'tags': [f'tag-{n}' for n in range(500)]}
+
+SCENARIOS = [
+    ('nested', '/items_nested/{n}', NESTED),
+    ('nested + HttpUrl', '/items_http/{n}', NESTED),
+    ('nested, 500 tags', '/items_nested/{n}', MANY_TAGS),
+]
+
+
+def make_app(chapter, route_class=None):
+    app = FastAPI()
+    if route_class is not None:
+        app.router.route_class = route_class
+
+    @app.put('/items_nested/{item_id}')
+    async def update_item_nested(item_id: int, item: chapter.ItemNested):
+        return {'item_id': item_id, 'item': item}
+
+    @app.put('/items_http/{item_id}')
+    async def update_item_http(item_id: int, item: chapter.ItemHttp):
+        return {'item_id': item_id, 'item': item}
+
+    return app
+
+
+async def run(app, url, body, requests):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+        for n in range(20):  # warm-up
+            (await client.put(url.format(n=n), json=body)).raise_for_status()
+        start = time.perf_counter()
+        for n in range(requests):
+            await client.put(url.format(n=n), json=body)
+        return requests / (time.perf_counter() - start)
+
+
+async def same_response(default, fast, url, body):
+    responses = []
+    for app in (default, fast):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+            responses.append((await client.put(url.format(n=1), json=body)).json())
+    return responses[0] == responses[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Default APIRoute vs JSONBodyRoute on nested bodies')
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    chapter = load_module('10_Body_Nested_Model/app.py')
+    default, fast = make_app(chapter), make_app(chapter, JSONBodyRoute)
+
+    print(f'{"scenario":<20} {"default req/s":>14} {"json route req/s":>17} {"gain":>7}   (best of {args.repeat})')
+    for name, url, body in SCENARIOS:
+        assert asyncio.run(same_response(default, fast, url, body)), name
+        before = max(asyncio.run(run(default, url, body, args.requests)) for _ in range(args.repeat))
+        after = max(asyncio.run(run(fast, url, body, args.requests)) for _ in range(args.repeat))
+        print(f'{name:<20} {before:>14.0f} {after:>17.0f} {after / before - 1:>+7.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Benchmark → GET /news filter evaluation: list of dicts vs NewsIndex vs ColumnarNewsStore
+# Run from the repo root: python benchmarks/bench_news_store.py [--sizes 100000 1000000]
+# The list-of-dicts path is the original chain of list comprehensions from 00-07-Assignment/solve.py.
+
+import argparse
+import datetime
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / '00-07-Assignment'))
+
+from datagen import START, make_articles  # noqa: E402
+from news_columnar import ColumnarNewsStore  # noqa: E402
+from news_index import NewsIndex  # noqa: E402
+
+
+def list_of_dicts(data, media_house=None, category=None, updated_after=None, keyword=None, offset=0, limit=10):
+    filtered_news = data
+    if media_house:
+        filtered_news = [news for news in filtered_news if news['media_house'] == media_house]
+    if category:
+        filtered_news = [news for news in filtered_news if news['category'] == category]
+    if updated_after:
+        filtered_news = [news for news in filtered_news if datetime.datetime.fromisoformat(news['updated_at']) > updated_after]
+    if keyword:
+        filtered_news = [news for news in filtered_news if keyword.lower() in list(map(str.lower, news.get('keywords', [])))]
+    return filtered_news[offset:offset + limit]
+
+
+QUERIES = {
+    'category': {'category': 'science'},
+    'media+category': {'media_house': 'BBC', 'category': 'science'},
+    'keyword': {'keyword': 'KW42'},
+    'updated_after': {'updated_after': START + datetime.timedelta(days=900)},
+    'all four': {'media_house': 'BBC', 'category': 'science', 'keyword': 'kw7',
+                 'updated_after': START + datetime.timedelta(days=200)},
+}
+
+
+def time_ms(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='News filter benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        data = make_articles(size)
+        start = time.perf_counter()
+        index = NewsIndex(data)
+        index_build = time.perf_counter() - start
+        start = time.perf_counter()
+        columnar = ColumnarNewsStore(data)
+        columnar_build = time.perf_counter() - start
+
+        print(f'\n{size} articles  (build: index {index_build:.1f}s, columnar {columnar_build:.1f}s)')
+        print(f'{"query":<16} {"list of dicts":>14} {"index":>10} {"columnar":>10}   (ms, best of {args.repeat})')
+        for name, params in QUERIES.items():
+            expected = [a['id'] for a in list_of_dicts(data, **params)]
+            assert [a['id'] for a in index.query(**params)[0]] == expected, name
+            assert [a['id'] for a in columnar.query(**params)[0]] == expected, name
+            print(
+                f'{name:<16}'
+                f' {time_ms(lambda: list_of_dicts(data, **params), args.repeat):>14.2f}'
+                f' {time_ms(lambda: index.query(**params), args.repeat):>10.2f}'
+                f' {time_ms(lambda: columnar.query(**params), args.repeat):>10.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
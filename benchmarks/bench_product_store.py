@@ -0,0 +1,80 @@
+# Benchmark → ProductRepository lookup / insert / delete latency as the catalog grows
+# Run from the repo root: python benchmarks/bench_product_store.py [--max-size 1000000]
+# With hash indexes the per-operation cost should stay flat from 1k to 1M products.
+# --backend sqlite runs the same operations against SQLiteProductRepository to compare throughput.
+
+import argparse
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / '00-04-Assignment'))
+
+import datagen  # noqa: E402
+from product_store import ProductRepository  # noqa: E402
+from solve import Product, Review  # noqa: E402
+from sqlite_store import SQLiteProductRepository  # noqa: E402
+
+
+def make_product(i):
+    return Product(**datagen.make_product(i))
+
+
+def fill(store, size, batch=10_000):
+    for start in range(0, size, batch):
+        store.add_many([make_product(i) for i in range(start, min(size, start + batch))])
+
+
+def open_store(backend, tmpdir):
+    if backend == 'sqlite':
+        return SQLiteProductRepository(str(pathlib.Path(tmpdir) / 'bench.db'), Product, Review)
+    return ProductRepository()
+
+
+def per_op_ns(fn, ops):
+    start = time.perf_counter_ns()
+    for arg in ops:
+        fn(arg)
+    return (time.perf_counter_ns() - start) / len(ops)
+
+
+def run(size, ops, backend='memory', seed=0):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = open_store(backend, tmpdir)
+        fill(store, size)
+        return measure(store, size, ops, rng)
+
+
+def measure(store, size, ops, rng):
+
+    ids = [rng.randint(1, size) for _ in range(ops)]
+    fresh = [make_product(size + i) for i in range(ops)]
+    dupes = [make_product(rng.randrange(size)) for _ in range(ops)]
+
+    lookup = per_op_ns(store.get, ids)
+    insert = per_op_ns(store.add, fresh)
+    duplicate = per_op_ns(store.add, dupes)
+    delete = per_op_ns(store.delete, list(set(ids)))
+    return {'size': size, 'lookup_ns': lookup, 'insert_ns': insert, 'duplicate_ns': duplicate, 'delete_ns': delete}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ProductRepository scaling benchmark')
+    parser.add_argument('--max-size', type=int, default=1_000_000)
+    parser.add_argument('--ops', type=int, default=10_000)
+    parser.add_argument('--backend', choices=('memory', 'sqlite'), default='memory')
+    args = parser.parse_args()
+
+    sizes = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= args.max_size]
+    print(f'backend: {args.backend}')
+    print(f'{"size":>10} {"lookup":>10} {"insert":>10} {"duplicate":>10} {"delete":>10}   (ns/op)')
+    for size in sizes:
+        r = run(size, args.ops, args.backend)
+        print(f'{r["size"]:>10} {r["lookup_ns"]:>10.0f} {r["insert_ns"]:>10.0f} {r["duplicate_ns"]:>10.0f} {r["delete_ns"]:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
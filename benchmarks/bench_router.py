@@ -0,0 +1,90 @@
+# Benchmark → route matching time vs number of routes: Starlette's linear scan vs shared/radix_router.py
+# Run from the repo root: python benchmarks/bench_router.py [--sizes 10 100 1000 5000]
+# The linear scan runs every route's regex until one matches, so its cost grows with the table; the tree walks
+# one node per path segment and should stay roughly flat. Only matching is timed (no handler, no validation).
+
+import argparse
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from starlette.routing import Match, Route, Router # type: ignore  # noqa: E402
+
+from shared.radix_router import RadixMatcher  # noqa: E402
+
+
+# Route shapes as in chapter 2: static, typed param, plain param, static next to a param, :path catch-all
+SHAPES = [
+    ('/svc{i}/items', lambda i, rng: f'/svc{i}/items'),
+    ('/svc{i}/items/{{item_id:int}}', lambda i, rng: f'/svc{i}/items/{rng.randrange(10_000)}'),
+    ('/svc{i}/users/me', lambda i, rng: f'/svc{i}/users/me'),
+    ('/svc{i}/users/{{user_id}}', lambda i, rng: f'/svc{i}/users/u{rng.randrange(10_000)}'),
+    ('/svc{i}/files/{{file_path:path}}', lambda i, rng: f'/svc{i}/files/docs/{rng.randrange(100)}/report.txt'),
+]
+
+
+async def endpoint(request):
+    pass
+
+
+def make_router(size):
+    return Router(routes=[Route(SHAPES[n % len(SHAPES)][0].format(i=n // len(SHAPES)), endpoint, name=str(n))
+                          for n in range(size)])
+
+
+def make_requests(size, count, seed=0):
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        n = rng.randrange(size)
+        path = SHAPES[n % len(SHAPES)][1](n // len(SHAPES), rng)
+        requests.append((n, {'type': 'http', 'method': 'GET', 'path': path, 'root_path': ''}))
+    return requests
+
+
+def linear_match(routes, scope):
+    # What Router.app does before dispatching
+    for route in routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return route, child_scope
+    return None
+
+
+def per_match_us(fn, scopes, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for scope in scopes:
+            fn(scope)
+        best = min(best, time.perf_counter() - start)
+    return best / len(scopes) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Route matching: linear scan vs radix tree')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"routes":>8} {"linear":>10} {"radix":>10} {"speedup":>8}   (µs per match, best of {args.repeat})')
+    for size in args.sizes:
+        router = make_router(size)
+        matcher = RadixMatcher(router)
+        matcher.build()
+        requests = make_requests(size, args.requests)
+        for n, scope in requests:
+            assert linear_match(router.routes, scope)[0].name == str(n), scope['path']
+            assert matcher.match(scope)[0].name == str(n), scope['path']
+        scopes = [scope for _, scope in requests]
+        linear = per_match_us(lambda scope: linear_match(router.routes, scope), scopes, args.repeat)
+        radix = per_match_us(matcher.match, scopes, args.repeat)
+        print(f'{size:>8} {linear:>10.2f} {radix:>10.2f} {linear / radix:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+# Benchmark → scaling curves of the assignment data layers from 10³ to 10⁶ records
+# Run from the repo root: python benchmarks/bench_scaling.py [--max-size 1000000] [--news-store columnar] [--check]
+# Times every product operation the routes use (lookup by id, duplicate check, review filtering, offset and
+# cursor pages) and every combination of the NewsFilterParams filters, plus news pagination, at each size.
+# The "slope" column is the fitted exponent k of time ∝ nᵏ: ~0 is flat, ~0.5 sublinear, ~1 linear. An operation
+# whose slope exceeds its target by more than --tolerance is marked ✗, and --check turns that into exit status 1.
+
+import argparse
+import datetime
+import itertools
+import math
+import pathlib
+import random
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.apps import load_module  # noqa: E402
+
+Product = load_module('00-04-Assignment/solve.py').Product  # puts 00-04-Assignment on sys.path
+sys.path.insert(0, str(ROOT / '00-07-Assignment'))
+
+from datagen import START, make_articles, make_product, make_products  # noqa: E402
+from news_columnar import ColumnarNewsStore  # noqa: E402
+from news_index import NewsIndex  # noqa: E402
+from product_store import ProductRepository  # noqa: E402
+
+
+FLAT, SUBLINEAR, LINEAR = 0, 0.5, 1
+FILTERS = {
+    'media_house': 'BBC',
+    'category': 'science',
+    'keyword': 'kw3',
+    'updated_after': START + datetime.timedelta(days=2 * 365),
+    'q': 'climate vaccine',
+}
+NEWS_STORES = {'index': NewsIndex, 'columnar': ColumnarNewsStore}
+
+
+def per_op_us(fn, args, repeat=3):
+    # Best of `repeat` passes over `args`, in µs per call
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for arg in args:
+            fn(arg)
+        best = min(best, (time.perf_counter() - start) / len(args))
+    return best * 1e6
+
+
+def product_curve(size, ops, rng):
+    store = ProductRepository()
+    store.add_many(Product(**p) for p in make_products(size))
+    ids = [rng.randint(1, size) for _ in range(ops)]
+    dupes = [Product(**make_product(rng.randrange(size))) for _ in range(ops)]
+    return {
+        ('lookup by id', FLAT): per_op_us(store.get, ids),
+        ('duplicate check', FLAT): per_op_us(store.add, dupes),
+        ('reviews ≥ 4', FLAT): per_op_us(lambda i: store.reviews(i, min_rating=4, limit=10), ids),
+        ('review stats', FLAT): per_op_us(store.review_stats, ids),
+        ('offset page (middle)', LINEAR): per_op_us(lambda i: store.list(skip=size // 2, limit=20), ids[:20]),
+        ('cursor page', FLAT): per_op_us(lambda i: store.page_after(i, limit=20), ids),
+    }
+
+
+def news_expected(names, indexed):
+    # Target exponent of a filter combination. The columnar store masks every row, so it is linear throughout.
+    # NewsIndex: one filter walks one sorted posting list to the first page (flat); several walk the smallest
+    # and probe the others, which slows as the intersection thins (sublinear). `q` stops ranking early once
+    # the top k is settled (sublinear), unless two or more filters leave so few matches that scoring all of
+    # them is cheaper, and that set grows with n
+    if not indexed:
+        return LINEAR
+    filters = [name for name in names if name != 'q']
+    if 'q' in names:
+        return SUBLINEAR if len(filters) <= 1 else LINEAR
+    return FLAT if len(filters) <= 1 else SUBLINEAR
+
+
+def news_curve(size, ops, rng, store_class):
+    articles = make_articles(size)
+    store = store_class(articles)
+    # Unfiltered, filtered and keyset pages are index walks in NewsIndex; the columnar store scans its columns
+    flat = store_class is NewsIndex
+    repeat = [None] * max(1, ops // 100)
+    curve = {}
+    for r in range(len(FILTERS) + 1):
+        for names in itertools.combinations(FILTERS, r):
+            params = {name: FILTERS[name] for name in names}
+            label = ' + '.join(names) or 'no filters'
+            curve[label, news_expected(names, flat)] = per_op_us(lambda _: store.query(**params), repeat)
+    curve['offset page (offset=40)', FLAT if flat else LINEAR] = per_op_us(
+        lambda _: store.query(offset=40), repeat)
+    afters = [rng.randint(1, size) for _ in range(ops)]
+    curve['cursor page', FLAT if flat else LINEAR] = per_op_us(lambda after: store.query(after=after), afters[:len(repeat)])
+    curve['category cursor page', FLAT if flat else LINEAR] = per_op_us(
+        lambda after: store.query(category='science', after=after), afters[:len(repeat)])
+    return curve
+
+
+def slope(sizes, times):
+    # Least-squares fit of log t = k log n + c
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(t, 1e-3)) for t in times]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+
+
+def report(title, sizes, curves, tolerance):
+    print(f'\n{title}   (µs per operation)')
+    print(f'{"operation":<52}' + ''.join(f'{n:>11}' for n in sizes) + f'{"slope":>8}{"target":>8}')
+    failed = []
+    for (name, expected) in curves[0]:
+        times = [curve[name, expected] for curve in curves]
+        k = slope(sizes, times)
+        bad = k > expected + tolerance
+        if bad:
+            failed.append(name)
+        print(f'{name:<52}' + ''.join(f'{t:>11.2f}' for t in times)
+              + f'{k:>8.2f}{expected:>8}' + ('  ✗' if bad else ''))
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Data-layer scaling benchmark')
+    parser.add_argument('--max-size', type=int, default=1_000_000)
+    parser.add_argument('--ops', type=int, default=2_000, help='calls per timed O(1) operation')
+    parser.add_argument('--news-store', choices=NEWS_STORES, default='index')
+    parser.add_argument('--tolerance', type=float, default=0.4, help='allowed slope above the expected exponent')
+    parser.add_argument('--check', action='store_true', help='exit with status 1 if any curve is marked ✗')
+    args = parser.parse_args()
+
+    sizes = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= args.max_size]
+    rng = random.Random(0)
+    failed = report('ProductRepository', sizes, [product_curve(n, args.ops, rng) for n in sizes], args.tolerance)
+    news = [news_curve(n, args.ops, rng, NEWS_STORES[args.news_store]) for n in sizes]
+    failed += report(f'News store: {args.news_store}', sizes, news, args.tolerance)
+    if args.check and failed:
+        print(f'\n{len(failed)} curve(s) over target: {", ".join(failed)}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# Benchmark → POST /index-weights/ (chapter 10) at 10⁶ entries: JSON vs application/x-npy vs raw records
+# Run from the repo root: python benchmarks/bench_weights.py [--entries 1000000] [--repeat 3]
+# "dict[int, float]" is the endpoint as it was before: FastAPI parses the JSON into a dict and Pydantic
+# validates it entry by entry, then the whole dict is echoed back. The other rows are the current endpoint,
+# which answers with a summary. decode = body bytes → arrays only; POST = the full request, in-process.
+
+import argparse
+import asyncio
+import io
+import json
+import pathlib
+import sys
+import time
+
+import httpx # type: ignore
+import numpy as np
+from fastapi import FastAPI # type: ignore
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from shared.apps import load_app, load_module  # noqa: E402
+
+
+def make_bodies(entries, seed=0):
+    rng = np.random.default_rng(seed)
+    keys = np.sort(rng.choice(entries * 10, entries, replace=False)).astype(np.int64)
+    values = rng.random(entries)
+    records = np.empty(entries, [('key', '<i8'), ('value', '<f8')])
+    records['key'], records['value'] = keys, values
+    npy = io.BytesIO()
+    np.save(npy, records)
+    return {
+        'application/json': json.dumps(dict(zip(map(str, keys.tolist()), values.tolist()))).encode(),
+        'application/x-npy': npy.getvalue(),
+        'application/octet-stream': records.tobytes(),
+    }
+
+
+def dict_app():
+    app = FastAPI()
+
+    @app.post('/index-weights/')
+    async def create_index_weights(weights: dict[int, float]):
+        return weights
+
+    return app
+
+
+def best_ms(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def post_ms(app, body, media_type, repeat):
+    best = float('inf')
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = await client.post('/index-weights/', content=body, headers={'content-type': media_type})
+            best = min(best, time.perf_counter() - start)
+            response.raise_for_status()
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index weights: JSON vs binary bodies')
+    parser.add_argument('--entries', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    weights = load_module('10_Body_Nested_Model/weight_vectors.py')
+    app = load_app('ch10')
+    bodies = make_bodies(args.entries)
+
+    def parse_json(body):
+        parser = weights.WeightsParser()
+        for start in range(0, len(body), 65536):
+            parser.feed(body[start:start + 65536])
+        parser.feed(b'', final=True)
+        return parser.result()
+
+    decoders = {'application/json': parse_json, **weights.DECODERS}
+    expected = parse_json(bodies['application/json'])
+    for media_type, decode in decoders.items():
+        vector = decode(bodies[media_type])
+        assert np.array_equal(vector.keys, expected.keys) and np.array_equal(vector.values, expected.values)
+
+    print(f'{args.entries} entries, best of {args.repeat}')
+    print(f'{"format":<26} {"body MB":>8} {"decode ms":>10} {"POST ms":>10}')
+    old = asyncio.run(post_ms(dict_app(), bodies['application/json'], 'application/json', args.repeat))
+    print(f'{"dict[int, float] (before)":<26} {len(bodies["application/json"]) / 1e6:>8.1f} {"":>10} {old:>10.0f}')
+    for media_type, body in bodies.items():
+        decode = best_ms(lambda: decoders[media_type](body), args.repeat)
+        post = asyncio.run(post_ms(app, body, media_type, args.repeat))
+        print(f'{media_type:<26} {len(body) / 1e6:>8.1f} {decode:>10.1f} {post:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
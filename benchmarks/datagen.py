@@ -0,0 +1,84 @@
+# Synthetic datasets → deterministic products (with reviews) and news articles for the benchmarks
+# The same (n, seed) always yields the same records, so timings from different runs and machines compare.
+# Categories, media houses, keywords and words are drawn from Zipf-like distributions (a few values are very
+# common, most are rare), which is what real catalogs and news feeds look like and what makes filter
+# selectivity vary across queries.
+
+import datetime
+import itertools
+import random
+
+
+CATEGORIES = ['technology', 'science', 'business', 'sports', 'health', 'politics', 'entertainment', 'world',
+              'environment', 'education', 'travel', 'food']
+MEDIA_HOUSES = ['Reuters', 'BBC', 'CNN', 'TechCrunch', 'Financial Times', 'The Verge', 'Wired', 'Science Daily',
+                'Bloomberg', 'Al Jazeera', 'The Guardian', 'Associated Press', 'Nature', 'Ars Technica']
+KEYWORDS = [f'kw{i}' for i in range(2000)]
+WORDS = ('ai climate market election vaccine launch study energy startup league policy court storm chip '
+         'quantum trade rally crisis report funding research bank space ocean data security health city '
+         'school travel museum film music record growth budget strike transport housing water carbon').split()
+REVIEWERS = [f'user{i}' for i in range(5000)]
+START = datetime.datetime(2022, 1, 1)
+SPAN = 3 * 365 * 86400  # seconds covered by updated_at
+
+
+def zipf_weights(n, s=1.1):
+    return list(itertools.accumulate(1 / rank ** s for rank in range(1, n + 1)))
+
+
+CATEGORY_W = zipf_weights(len(CATEGORIES))
+MEDIA_W = zipf_weights(len(MEDIA_HOUSES))
+KEYWORD_W = zipf_weights(len(KEYWORDS))
+WORD_W = zipf_weights(len(WORDS))
+RATING_W = list(itertools.accumulate([2, 3, 5, 10, 30, 50]))  # 0..5 stars, skewed towards the top like real reviews
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choices(WORDS, cum_weights=WORD_W, k=words))
+
+
+def make_articles(n, seed=0):
+    # News articles shaped like 00-07-Assignment's NewsArticle (updated_at as an ISO string)
+    rng = random.Random(seed)
+    return [
+        {
+            'id': i,
+            'title': sentence(rng, rng.randint(4, 10)).capitalize(),
+            'category': rng.choices(CATEGORIES, cum_weights=CATEGORY_W)[0],
+            'media_house': rng.choices(MEDIA_HOUSES, cum_weights=MEDIA_W)[0],
+            'updated_at': (START + datetime.timedelta(seconds=rng.randrange(SPAN))).isoformat(),
+            'summary': sentence(rng, rng.randint(10, 30)),
+            'keywords': sorted(set(rng.choices(KEYWORDS, cum_weights=KEYWORD_W, k=rng.randint(0, 5)))),
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def make_reviews(rng, count):
+    return [
+        {
+            'reviewer': rng.choice(REVIEWERS),
+            'rating': rng.choices(range(6), cum_weights=RATING_W)[0],
+            'comment': sentence(rng, rng.randint(3, 12)),
+        }
+        for _ in range(count)
+    ]
+
+
+def make_product(i, rng=None, reviews=0):
+    # Product i is always the same record (same name, description, price, stock), so make_product(i) for an
+    # already loaded i is a duplicate
+    return {
+        'name': f'Product {i}',
+        'description': f'Description of product {i}',
+        'price': round(1 + (i * 7919) % 99_900 / 100, 2),
+        'in_stock': i % 50,
+        'reviews': make_reviews(rng or random.Random(i), reviews) if reviews else [],
+    }
+
+
+def make_products(n, seed=0, mean_reviews=3):
+    # Products with a long-tailed number of reviews: most have a handful, a few have hundreds
+    rng = random.Random(seed)
+    # (pareto(1.5) - 1 has mean 2)
+    return [make_product(i, rng, min(500, int(mean_reviews * (rng.paretovariate(1.5) - 1) / 2))) for i in range(n)]
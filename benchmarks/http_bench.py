@@ -0,0 +1,279 @@
+# Benchmark → HTTP load on every chapter app: req/s and p50 / p95 / p99 latency per scenario
+# Run from the repo root:
+#   python benchmarks/http_bench.py                                  # all apps, in-process (ASGI transport)
+#   python benchmarks/http_bench.py ch04 assignment-07 --server      # same mixes against a local uvicorn
+#   python benchmarks/http_bench.py --output benchmarks/baseline.json               # store a baseline
+#   python benchmarks/http_bench.py --baseline benchmarks/baseline.json --threshold 0.2
+# In-process runs measure the framework + app code only; --server adds the HTTP parser and the socket.
+# With --baseline, any scenario whose req/s drops or p95 grows by more than --threshold is reported and the
+# script exits with status 1, so it can gate a CI job.
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import pathlib
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+import httpx # type: ignore
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from shared.apps import APPS, load_app  # noqa: E402
+
+
+ITEM = {'name': 'Foo', 'description': 'A very nice Item', 'price': 35.4, 'tax': 3.2}
+NESTED = {**ITEM, 'tags': ['rock', 'metal', 'bar'], 'images': [
+    {'url': 'http://example.com/baz.jpg', 'name': 'The Foo live'},
+    {'url': 'http://example.com/dave.jpg', 'name': 'The Baz'},
+]}
+PRODUCTS = 200  # seeded before the assignment-04 mix runs
+
+
+def product(n):
+    return {'name': f'Product {n}', 'description': f'Description {n}', 'price': 1 + n % 100, 'in_stock': n % 7}
+
+
+# app → [(scenario, request factory[, expected status])]. A factory takes the request number and returns
+# (method, url, json body). Any other status than the expected one (200 unless given) counts as an error
+SCENARIOS = {
+    'ch00': [
+        ('root', lambda n: ('GET', '/', None)),
+        ('path+query', lambda n: ('GET', f'/items/{n}?q=somequery', None)),
+        ('body', lambda n: ('PUT', f'/items/{n}', {'name': 'Foo', 'price': 12.5, 'is_offer': True})),
+    ],
+    'ch01': [
+        ('root', lambda n: ('GET', '/', None)),
+    ],
+    'ch02': [
+        ('untyped path', lambda n: ('GET', f'/items/{n}', None)),
+        ('typed path', lambda n: ('GET', f'/typed-items/{n}', None)),
+        ('static before param', lambda n: ('GET', '/users/me', None)),
+        ('enum path', lambda n: ('GET', '/items-enum/item_2', None)),
+        ('path converter', lambda n: ('GET', '/files/docs/hello.txt', None)),
+    ],
+    'ch03': [
+        ('defaults', lambda n: ('GET', '/items/?skip=0&limit=10', None)),
+        ('two path params', lambda n: ('GET', f'/users/{n}/items/foo?q=bar&short=true', None)),
+        ('required query', lambda n: ('GET', f'/items_required/{n}?needy=yes', None)),
+    ],
+    'ch04': [
+        ('create', lambda n: ('POST', '/items/', ITEM)),
+        ('path+body+query', lambda n: ('PUT', f'/items/{n}?q=somequery', ITEM)),
+    ],
+    'ch05': [
+        ('max_length', lambda n: ('GET', '/items_50/?q=somequery', None)),
+        ('pattern', lambda n: ('GET', '/items_regex/?q=fixedquery', None)),
+        ('list', lambda n: ('GET', '/items_list/?q=foo&q=bar&q=baz', None)),
+        ('invalid → 422', lambda n: ('GET', '/items_regex/?q=nope', None), 422),
+    ],
+    'ch06': [
+        ('alias', lambda n: ('GET', f'/items/{n}?item-query=foo', None)),
+        ('ge=1', lambda n: ('GET', f'/items_nv/{n + 1}?q=foo', None)),
+    ],
+    'ch07': [
+        ('query model', lambda n: ('GET', '/items/?limit=10&offset=5&order_by=updated_at&tags=a&tags=b', None)),
+    ],
+    'ch08': [
+        ('optional body', lambda n: ('PUT', f'/items/{n % 1000}?q=foo', ITEM)),
+        ('two bodies', lambda n: ('PUT', f'/items_multiple/{n}', {'item': ITEM, 'user': {'username': 'dave'}})),
+        ('singular body value', lambda n: ('PUT', f'/items_singular_item/{n}',
+                                           {'item': ITEM, 'user': {'username': 'dave'}, 'importance': 5})),
+    ],
+    'ch09': [
+        ('embedded Field body', lambda n: ('PUT', f'/items/{n}', {'item': ITEM})),
+    ],
+    'ch10': [
+        ('list + set', lambda n: ('PUT', f'/items/{n}', {**ITEM, 'tags': ['a', 'b'], 'distributors': ['x', 'x']})),
+        ('nested models', lambda n: ('PUT', f'/items_nested/{n}', NESTED)),
+        ('HttpUrl', lambda n: ('PUT', f'/items_http/{n}', NESTED)),
+        ('dict[int, float]', lambda n: ('POST', '/index-weights/', {str(i): i / 10 for i in range(20)})),
+    ],
+    'ch11': [
+        ('json_schema_extra', lambda n: ('PUT', f'/items/{n}', ITEM)),
+        ('Field examples', lambda n: ('PUT', f'/items_field/{n}', {'item': ITEM, 'user': {'name': 'Avi'}})),
+        ('Body examples', lambda n: ('PUT', f'/items_body/{n}', ITEM)),
+        ('openapi_examples', lambda n: ('PUT', f'/items_openapi/{n}', ITEM)),
+    ],
+    'assignment-04': [
+        ('create', lambda n: ('POST', '/products', product(PRODUCTS + n + 1))),
+        ('read', lambda n: ('GET', f'/products/{n % PRODUCTS + 1}', None)),
+        ('list page', lambda n: ('GET', '/products?limit=20', None)),
+        ('add review', lambda n: ('PUT', f'/products/{n % PRODUCTS + 1}/reviews',
+                                  {'reviewer': 'bench', 'rating': n % 6, 'comment': 'ok'})),
+        ('reviews ≥ 3', lambda n: ('GET', f'/products/{n % PRODUCTS + 1}/reviews?min_rating=3', None)),
+        ('review stats', lambda n: ('GET', f'/products/{n % PRODUCTS + 1}/reviews/stats', None)),
+    ],
+    'assignment-07': [
+        ('all', lambda n: ('GET', '/news', None)),
+        ('category', lambda n: ('GET', '/news?category=technology', None)),
+        ('media+keyword', lambda n: ('GET', '/news?media-house=TechCrunch&keyword=AI', None)),
+        ('updated_after', lambda n: ('GET', '/news?updated_after=2024-01-01T00:00:00', None)),
+        ('full-text', lambda n: ('GET', '/news?q=climate', None)),
+        ('by id', lambda n: ('GET', f'/news/{n % 3 + 1}', None)),
+    ],
+}
+
+
+async def setup(key, client):
+    # State a mix needs before it is timed
+    if key == 'assignment-04':
+        for n in range(1, PRODUCTS + 1):
+            (await client.post('/products', json=product(n))).raise_for_status()
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+async def run_scenario(client, factory, expected, requests, concurrency):
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for n in counter:
+            method, url, body = factory(n)
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != expected:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': requests,
+        'errors': errors,
+        'req_per_s': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def run_mix(key, client, args):
+    await setup(key, client)
+    results = {}
+    for name, factory, *status in SCENARIOS[key]:
+        expected = status[0] if status else 200
+        await run_scenario(client, factory, expected, min(args.warmup, args.requests), args.concurrency)
+        results[name] = await run_scenario(client, factory, expected, args.requests, args.concurrency)
+        print_row(key, name, results[name])
+    return results
+
+
+async def bench_in_process(key, args):
+    app = load_app(key)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            return await run_mix(key, client, args)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def uvicorn_server(key):
+    path = ROOT / APPS[key]
+    port = free_port()
+    command = [sys.executable, '-m', 'uvicorn', f'{path.stem}:app', '--app-dir', str(path.parent),
+               '--port', str(port), '--log-level', 'warning', '--no-access-log']
+    server = subprocess.Popen(command, cwd=path.parent)
+    try:
+        url = f'http://127.0.0.1:{port}'
+        deadline = time.monotonic() + 30
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f'uvicorn exited with status {server.returncode} while starting {key}')
+            try:
+                httpx.get(url + '/openapi.json', timeout=1)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f'uvicorn did not start {key} within 30s')
+                time.sleep(0.1)
+        yield url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def bench_server(key, args):
+    with uvicorn_server(key) as url:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits) as client:
+            return await run_mix(key, client, args)
+
+
+def print_row(key, name, r):
+    print(f'{key:<14} {name:<22} {r["req_per_s"]:>9.1f} {r["p50_ms"]:>8.2f} {r["p95_ms"]:>8.2f} {r["p99_ms"]:>8.2f}'
+          + (f'   {r["errors"]} errors' if r['errors'] else ''))
+
+
+def regressions(results, baseline, threshold):
+    found = []
+    for key, scenarios in results.items():
+        for name, r in scenarios.items():
+            before = baseline.get(key, {}).get(name)
+            if before is None:
+                continue
+            if r['req_per_s'] < before['req_per_s'] * (1 - threshold):
+                found.append(f'{key} / {name}: {before["req_per_s"]} → {r["req_per_s"]} req/s')
+            if r['p95_ms'] > before['p95_ms'] * (1 + threshold):
+                found.append(f'{key} / {name}: p95 {before["p95_ms"]} → {r["p95_ms"]} ms')
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP load benchmark for the chapter apps')
+    parser.add_argument('apps', nargs='*', choices=[[], *APPS], default=[], metavar='APP',
+                        help=f'apps to run (default: all): {", ".join(APPS)}')
+    parser.add_argument('--server', action='store_true', help='drive a local uvicorn instead of the ASGI transport')
+    parser.add_argument('--requests', type=int, default=1000, help='timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=100, help='untimed requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--output', type=pathlib.Path, help='write the results here as JSON')
+    parser.add_argument('--baseline', type=pathlib.Path, help='results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15, help='allowed relative slowdown (0.15 = 15%%)')
+    args = parser.parse_args()
+
+    bench = bench_server if args.server else bench_in_process
+    print(f'{"app":<14} {"scenario":<22} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+    results = {key: asyncio.run(bench(key, args)) for key in args.apps or APPS}
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            'mode': 'server' if args.server else 'in-process',
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'results': results,
+        }, indent=2, ensure_ascii=False) + '\n')
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        found = regressions(results, baseline['results'], args.threshold)
+        for line in found:
+            print(f'REGRESSION  {line}')
+        if found:
+            sys.exit(1)
+        print(f'No regressions beyond {args.threshold:.0%} of {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+# Gateway → every chapter app in one process, each mounted under its own prefix and imported on first use
+# Run from the repo root:  uvicorn gateway:app            (then e.g. /ch02/docs, /assignment-04/products)
+# Startup only imports FastAPI and this file; a chapter's module (and its models, stores, corpus…) is imported
+# and built on the first request below its prefix, in the threadpool so the other prefixes keep serving.
+# Sub-app lifespans (e.g. the news corpus watcher) are entered when the app loads and exited on shutdown.
+# GET /gateway reports the startup and per-app load times; GATEWAY_EAGER=1 loads everything at startup instead.
+# python gateway.py [--runs 5] measures lazy vs eager startup in fresh interpreters.
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import subprocess
+import sys
+from time import perf_counter
+
+STARTED = perf_counter()
+
+from fastapi import FastAPI # type: ignore  # noqa: E402
+from fastapi.concurrency import run_in_threadpool # type: ignore  # noqa: E402
+from starlette.responses import PlainTextResponse # type: ignore  # noqa: E402
+from starlette.routing import Mount # type: ignore  # noqa: E402
+
+from shared.apps import APPS, load_app  # noqa: E402
+
+
+logger = logging.getLogger('gateway')
+
+
+class LazyApp:
+    # ASGI app that imports and builds the real chapter app on its first request
+    def __init__(self, key, lifespans):
+        self.key = key
+        self.app = None
+        self.load_ms = None
+        self.error = None
+        self._lifespans = lifespans
+        self._lock = asyncio.Lock()
+
+    async def load(self):
+        async with self._lock:
+            if self.app is not None:
+                return
+            start = perf_counter()
+            try:
+                app = await run_in_threadpool(load_app, self.key)
+                await self._lifespans.enter_async_context(app.router.lifespan_context(app))
+            except Exception as e:
+                self.error = f'{type(e).__name__}: {e}'
+                logger.exception('Loading %s failed', self.key)
+                raise
+            self.load_ms = round((perf_counter() - start) * 1000, 3)
+            self.error = None
+            self.app = app
+            logger.info('Loaded %s in %.1f ms', self.key, self.load_ms)
+
+    async def __call__(self, scope, receive, send):
+        if self.app is None:
+            if scope['type'] == 'lifespan':
+                return  # the gateway runs sub-app lifespans itself, once they are loaded
+            try:
+                await self.load()
+            except Exception:
+                return await PlainTextResponse(f'{self.key} failed to load', status_code=500)(scope, receive, send)
+        await self.app(scope, receive, send)
+
+
+lifespans = contextlib.AsyncExitStack()
+apps = {key: LazyApp(key, lifespans) for key in APPS}
+EAGER = os.environ.get('GATEWAY_EAGER') == '1'
+
+
+@contextlib.asynccontextmanager
+async def lifespan(gateway):
+    if EAGER:
+        for lazy in apps.values():
+            await lazy.load()
+    report['ready_ms'] = round((perf_counter() - STARTED) * 1000, 3)
+    async with lifespans:
+        yield
+
+
+gateway = FastAPI(title='FastAPI in a Week — gateway', lifespan=lifespan)
+app = gateway  # `uvicorn gateway:app`
+report = {'eager': EAGER}
+
+
+@gateway.get('/gateway')
+async def gateway_status():
+    loaded = {key: lazy.load_ms for key, lazy in apps.items() if lazy.app is not None}
+    return {
+        **report,
+        'loaded': loaded,
+        'loaded_total_ms': round(sum(loaded.values()), 3),
+        'not_loaded': [key for key, lazy in apps.items() if lazy.app is None],
+        'errors': {key: lazy.error for key, lazy in apps.items() if lazy.error},
+        'prefixes': {key: f'/{key}' for key in apps},
+    }
+
+
+for key, lazy in apps.items():
+    gateway.router.routes.append(Mount(f'/{key}', app=lazy, name=key))
+
+report['import_ms'] = round((perf_counter() - STARTED) * 1000, 3)
+
+
+STARTUP_PROBE = '''
+import asyncio, json, sys, time
+start = time.perf_counter()
+import gateway
+async def main():
+    async with gateway.gateway.router.lifespan_context(gateway.gateway):
+        pass
+asyncio.run(main())
+print(json.dumps({"startup_ms": (time.perf_counter() - start) * 1000}))
+'''
+
+
+def measure(eager, runs):
+    env = {**os.environ, 'GATEWAY_EAGER': '1' if eager else '0', 'NEWS_RELOAD_INTERVAL': '0'}
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', STARTUP_PROBE], env=env, capture_output=True, text=True,
+                             check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        times.append(json.loads(out.stdout.strip().splitlines()[-1])['startup_ms'])
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gateway startup: lazy vs eager import of the chapter apps')
+    parser.add_argument('--runs', type=int, default=3, help='fresh interpreters per mode; the best is kept')
+    args = parser.parse_args()
+    lazy, eager = measure(False, args.runs), measure(True, args.runs)
+    print(f'{len(APPS)} apps, best of {args.runs} fresh interpreters (import + lifespan startup)')
+    print(f'  lazy  : {lazy:8.1f} ms')
+    print(f'  eager : {eager:8.1f} ms')
+    print(f'  saved : {eager - lazy:8.1f} ms ({1 - lazy / eager:.0%}) until the first request to each prefix')
+
+
+if __name__ == '__main__':
+    main()
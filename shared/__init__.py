@@ -0,0 +1 @@
+# Helpers shared by the assignment apps (import with the repo root on sys.path)
@@ -0,0 +1,55 @@
+# Chapter app registry → every FastAPI app in the repo, loadable by file path
+# The chapter folders start with digits, so they are not importable packages. Each app is loaded from its
+# file under a unique module name, with its folder on sys.path for sibling helpers (product_store, news_index…).
+
+import importlib.util
+import pathlib
+import re
+import sys
+
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+# prefix → app file, relative to the repo root
+APPS = {
+    'ch00': '00_Hello_World/main.py',
+    'ch01': '01_First_Steps/app.py',
+    'ch02': '02_Path_Parameters/app.py',
+    'ch03': '03_Query_Parameters/app.py',
+    'ch04': '04_Request_Body/app.py',
+    'ch05': '05_Query_Param_and_String_Validation/app.py',
+    'ch06': '06_Path_param_and_Numeric_Validation/app.py',
+    'ch07': '07_Query_Param_Models/app.py',
+    'ch08': '08_Body_Multiple_Parameters/app.py',
+    'ch09': '09_Body_Fields/app.py',
+    'ch10': '10_Body_Nested_Model/app.py',
+    'ch11': '11_Declare_Request_Example_Data/app.py',
+    'assignment-04': '00-04-Assignment/solve.py',
+    'assignment-07': '00-07-Assignment/solve.py',
+}
+
+
+def module_name(relpath):
+    return 'chapter_' + re.sub(r'\W', '_', relpath.removesuffix('.py'))
+
+
+def load_module(relpath):
+    name = module_name(relpath)
+    if name in sys.modules:
+        return sys.modules[name]
+    path = ROOT / relpath
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def load_app(key):
+    return load_module(APPS[key]).app
@@ -0,0 +1,66 @@
+# Result cache → bounded LRU with a per-entry TTL and version-based invalidation
+# Entries remember the data version they were computed from; a lookup against a newer version is a miss,
+# so bumping the version counter on any data change invalidates everything without walking the cache.
+
+import time
+from collections import OrderedDict
+
+
+MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, maxsize=1024, ttl=30.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key → (expires_at, version, value), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0      # dropped to stay within maxsize
+        self.expirations = 0    # dropped because the TTL ran out
+        self.invalidations = 0  # dropped because the data version moved on
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version=None):
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, entry_version, value = entry
+            if entry_version != version:
+                self.invalidations += 1
+                del self._entries[key]
+            elif expires_at <= self.clock():
+                self.expirations += 1
+                del self._entries[key]
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+        self.misses += 1
+        return MISSING
+
+    def set(self, key, value, version=None):
+        self._entries[key] = (self.clock() + self.ttl, version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else None,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
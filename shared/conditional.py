@@ -0,0 +1,51 @@
+# Conditional requests → ETag / If-None-Match and Last-Modified / If-Modified-Since
+# ETags are built from version counters the stores already keep, never by hashing the response body, so a
+# matching request can be answered with 304 before the handler loads or serializes anything.
+
+import email.utils
+import secrets
+
+from fastapi import Response # type: ignore
+
+
+# Distinguishes in-memory versions across restarts: "product 1, version 1" means different things in two processes
+BOOT_ID = secrets.token_hex(4)
+
+
+def make_etag(*parts):
+    return '"' + '.'.join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request, etag):
+    # If-None-Match uses the weak comparison: W/ prefixes are ignored
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return any(candidate.strip().removeprefix('W/') == etag for candidate in header.split(','))
+
+
+def http_date(epoch):
+    return email.utils.formatdate(epoch, usegmt=True)
+
+
+def not_modified_since(request, epoch):
+    # If-Modified-Since only counts when the client sent no If-None-Match (RFC 9110 §13.1.3)
+    header = request.headers.get('if-modified-since')
+    if not header or 'if-none-match' in request.headers:
+        return False
+    try:
+        since = email.utils.parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return int(epoch) <= since.timestamp()  # HTTP dates have whole-second resolution
+
+
+def not_modified(etag=None, last_modified=None):
+    headers = {}
+    if etag is not None:
+        headers['ETag'] = etag
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return Response(status_code=304, headers=headers)
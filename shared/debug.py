@@ -0,0 +1,76 @@
+# Debug endpoint guard → /debug/* routes only answer when DEBUG_TOKEN is set and sent back as X-Debug-Token
+# Unset, they are indistinguishable from missing routes (404), so they can stay compiled into every deployment.
+# debug_router() builds the /metrics and /debug/* routes every instrumented app serves, around that app's own
+# metrics, tracer, profiler, memory tracker and store sizes.
+
+import os
+import secrets
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response # type: ignore
+from fastapi.concurrency import run_in_threadpool # type: ignore
+from fastapi.routing import APIRoute # type: ignore
+
+from shared.metrics import CONTENT_TYPE
+from shared.profiler import ProfilerBusy, collapsed
+
+
+DEBUG_TOKEN = os.environ.get('DEBUG_TOKEN', '')
+
+
+def require_debug_token(x_debug_token: Annotated[str | None, Header()] = None):
+    if not DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail='Not Found')
+    if x_debug_token is None or not secrets.compare_digest(x_debug_token, DEBUG_TOKEN):
+        raise HTTPException(status_code=403, detail='Invalid or missing X-Debug-Token')
+
+
+def debug_router(metrics, tracer, profiler, memory, store_sizes, route_class=APIRoute):
+    # store_sizes() → {name: {'items': ..., 'bytes': ...}} for the app's long-lived structures; it runs in the
+    # threadpool. Pass the app's instrumented route class so these routes are measured like the others
+    router = APIRouter(route_class=route_class, include_in_schema=False)
+    guarded = [Depends(require_debug_token)]
+
+    @router.get('/metrics')
+    async def prometheus_metrics():
+        return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+    @router.get('/debug/traces', dependencies=guarded)
+    async def slow_request_traces(limit: Annotated[int, Query(ge=1, le=500)] = 50, route: str | None = None):
+        # Most recent slow / failed requests first, filtered by route template, e.g. ?route=/news/{news_id}
+        return {'tracer': tracer.status(), 'traces': tracer.recent(limit, route)}
+
+    @router.get('/debug/profile', dependencies=guarded)
+    async def profile(seconds: Annotated[float, Query(gt=0, le=60)] = 10, idle: bool = False):
+        # Samples every thread while traffic keeps being served; the collapsed stacks feed flamegraph.pl /
+        # speedscope. Threads parked in select() / wait() are left out unless idle=true
+        try:
+            stacks, samples = await run_in_threadpool(profiler.sample, seconds)
+        except ProfilerBusy as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        return Response(collapsed(stacks, idle), media_type='text/plain', headers={'X-Profile-Samples': str(samples)})
+
+    @router.post('/debug/memory/start', dependencies=guarded)
+    async def memory_start(frames: Annotated[int, Query(ge=1, le=50)] = 1):
+        # Starts tracemalloc (`frames` deep tracebacks) and takes the baseline snapshot; calling it again resets both
+        memory.enable(frames)
+        return memory.status()
+
+    @router.get('/debug/memory', dependencies=guarded)
+    async def memory_report(
+        limit: Annotated[int, Query(ge=1, le=500)] = 20,
+        group_by: Literal['lineno', 'filename', 'traceback'] = 'lineno',
+    ):
+        # Growth since the baseline by source location, net allocations per route, and the size of the stores
+        return {
+            **memory.status(),
+            'stores': await run_in_threadpool(store_sizes),
+            'top': await run_in_threadpool(memory.diff, limit, group_by),
+        }
+
+    @router.post('/debug/memory/stop', dependencies=guarded)
+    async def memory_stop():
+        memory.disable()
+        return memory.status()
+
+    return router
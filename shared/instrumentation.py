@@ -0,0 +1,160 @@
+# Route instrumentation → timestamps for each phase of every request, handed to observers (metrics, tracing…)
+# instrument(app, observer, …) must run right after the app is created, before any route is declared: it sets
+# app.router.route_class, so every APIRoute the decorators build is an InstrumentedRoute. Observers get
+# start(timing) when the route is entered and finish(timing) once the response object exists.
+# Phases: parse = body read + parameter/body validation, handler = the endpoint itself,
+#         serialize = response_model validation + JSON encoding of the return value.
+# A small ASGI middleware also stamps when the request entered the app, so routing time can be told apart.
+
+import contextvars
+import copy
+import functools
+import inspect
+from time import perf_counter
+
+from fastapi.exceptions import RequestValidationError # type: ignore
+from fastapi.routing import APIRoute # type: ignore
+from starlette.exceptions import HTTPException # type: ignore
+
+
+RECEIVED = 'instrumentation.received'  # scope key: perf_counter() when the request entered the (outermost) app
+
+
+class RequestTiming:
+    __slots__ = ('route', 'method', 'path', 'query', 'status', 'error',
+                 'received', 'start', 'body_end', 'handler_start', 'handler_end', 'end')
+
+    def __init__(self, route, method, path='', query=b'', received=None):
+        self.route = route            # route template, e.g. /products/{product_id}
+        self.method = method
+        self.path = path              # the actual path and raw query string
+        self.query = query
+        self.status = None
+        self.error = None             # exception type name when the handler raised something unexpected
+        self.received = received      # before middleware and routing; None without StampReceived
+        self.start = perf_counter()   # route matched
+        self.body_end = None          # JSON / form body fully received (routes with a body only)
+        self.handler_start = None     # None when validation failed before the endpoint ran
+        self.handler_end = None
+        self.end = None
+
+    @property
+    def target(self):
+        return f"{self.path}?{self.query.decode('latin-1')}" if self.query else self.path
+
+    def phases(self):
+        # (phase, seconds) for every phase the request reached
+        if self.handler_start is None:
+            return [('parse', self.end - self.start)]
+        phases = [('parse', self.handler_start - self.start), ('handler', self.handler_end - self.handler_start)]
+        if self.error is None:
+            phases.append(('serialize', self.end - self.handler_end))
+        return phases
+
+    def spans(self):
+        # (name, start, end) for each step the request went through, in order. `dependencies` is FastAPI resolving
+        # the path / query / header parameters and validating the body, which it does in one pass
+        validated = self.handler_start if self.handler_start is not None else self.end  # rejected → ran to the end
+        marks = [('routing', self.received, self.start), ('body', self.start, self.body_end),
+                 ('dependencies', self.body_end or self.start, validated),
+                 ('handler', self.handler_start, self.handler_end),
+                 ('encode', self.handler_end, self.end)]
+        return [(name, start, end) for name, start, end in marks if start is not None and end is not None]
+
+
+_current = contextvars.ContextVar('request_timing', default=None)
+
+
+def current_timing():
+    return _current.get()
+
+
+def timed(call):
+    # Wraps the endpoint so it stamps handler_start / handler_end on the request's timing. Sync endpoints stay
+    # sync (FastAPI still runs them in the threadpool, which copies the context and so sees the same timing)
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args, **kwargs):
+            timing = _current.get()
+            timing.handler_start = perf_counter()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                timing.handler_end = perf_counter()
+    else:
+        @functools.wraps(call)
+        def endpoint(*args, **kwargs):
+            timing = _current.get()
+            timing.handler_start = perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                timing.handler_end = perf_counter()
+    return endpoint
+
+
+class InstrumentedRoute(APIRoute):
+    observers = []  # replaced per app by instrument()
+
+    def get_route_handler(self):
+        # Build FastAPI's handler around a copy of the dependant whose call is the timed endpoint; the route
+        # keeps the original for OpenAPI and everything else
+        dependant = self.dependant
+        self.dependant = copy.copy(dependant)
+        self.dependant.call = timed(dependant.call)
+        try:
+            handler = super().get_route_handler()
+        finally:
+            self.dependant = dependant
+        route, observers = self.path_format, self.observers
+        # Routes with a JSON / form body: receive it up front (FastAPI reuses the cached bytes) to time it apart
+        # from validation. Routes that stream request.stream() themselves have no body_field and are left alone
+        has_body = self.body_field is not None
+
+        async def instrumented(request):
+            scope = request.scope
+            timing = RequestTiming(route, request.method, scope['path'], scope['query_string'], scope.get(RECEIVED))
+            token = _current.set(timing)
+            for observer in observers:
+                observer.start(timing)
+            try:
+                if has_body:
+                    await request.body()
+                    timing.body_end = perf_counter()
+                response = await handler(request)
+                timing.status = response.status_code
+                return response
+            except HTTPException as e:
+                timing.status = e.status_code
+                raise
+            except RequestValidationError:
+                timing.status = 422
+                raise
+            except Exception as e:
+                timing.status = 500
+                timing.error = type(e).__name__
+                raise
+            finally:
+                timing.end = perf_counter()
+                _current.reset(token)
+                for observer in observers:
+                    observer.finish(timing)
+        return instrumented
+
+
+class StampReceived:
+    # Outermost ASGI middleware: records when the request arrived. setdefault, so when apps are mounted inside
+    # each other the outer stamp wins
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            scope.setdefault(RECEIVED, perf_counter())
+        await self.app(scope, receive, send)
+
+
+def instrument(app, *observers):
+    app.add_middleware(StampReceived)
+    app.router.route_class = type('InstrumentedRoute', (InstrumentedRoute,), {'observers': list(observers)})
+    return app.router.route_class
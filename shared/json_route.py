@@ -0,0 +1,124 @@
+# JSON body route → single-model request bodies validated straight from the raw bytes, responses dumped by Pydantic
+# Set it on an app before any route is declared:  app.router.route_class = JSONBodyRoute
+# Request side: FastAPI json.loads the body into dicts and lists, then has Pydantic validate those into the model.
+# Here the body bytes go to the route's own TypeAdapter with validate_json (built once per route, when FastAPI
+# creates the body field), so no intermediate Python objects exist. FastAPI then receives the finished model,
+# which it accepts as is. Bodies that fail validation are handed back to FastAPI untouched, so 422 responses
+# (error locations, the JSON decode error format) stay exactly as before.
+# Response side: a model, or a dict / list holding models, returned from a route without response_model is
+# serialized by Pydantic's Rust serializer (model_dump_json / to_json) instead of jsonable_encoder + json.dumps.
+# Results holding a NaN or ±inf float are left to FastAPI too: Pydantic would quietly write null, FastAPI fails
+# the request (500) as it always has.
+# Anything else (response_model routes, Response objects, injected `response: Response`, custom response
+# classes) goes through FastAPI's normal path.
+
+import copy
+import functools
+import inspect
+import math
+import types
+import typing
+
+from fastapi.datastructures import DefaultPlaceholder # type: ignore
+from fastapi.params import Form # type: ignore
+from fastapi.routing import APIRoute # type: ignore
+from pydantic import BaseModel, ValidationError # type: ignore
+from pydantic_core import PydanticSerializationError, to_json # type: ignore
+from starlette.responses import JSONResponse, Response # type: ignore
+
+
+def body_model(annotation):
+    # The model class of a `Model` or `Model | None` annotation, else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return body_model(args[0])
+    return None
+
+
+def is_json(content_type):
+    media_type = content_type.partition(';')[0].strip().lower()
+    return media_type == 'application/json' or (media_type.startswith('application/')
+                                                 and media_type.endswith('+json'))
+
+
+def finite(value):
+    # False if any float inside `value` (models, dicts, lists, tuples, sets) is NaN or ±inf
+    if isinstance(value, float):
+        return math.isfinite(value)
+    if isinstance(value, BaseModel):
+        return finite(value.__dict__) and finite(value.__pydantic_extra__ or {})
+    if isinstance(value, dict):
+        return all(finite(item) for item in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(finite(item) for item in value)
+    return True
+
+
+def dump(result, status_code):
+    # Response with the JSON bytes of `result`, or None to let FastAPI encode it
+    if not finite(result):
+        return None
+    try:
+        if isinstance(result, BaseModel):
+            body = result.model_dump_json(by_alias=True)
+        elif isinstance(result, (dict, list)):
+            body = to_json(result, by_alias=True)
+        else:
+            return None
+    except PydanticSerializationError:
+        return None
+    return Response(body, status_code=status_code, media_type='application/json')
+
+
+def dumped(call, status_code):
+    # Wraps the endpoint so its return value leaves as a ready Response, which FastAPI passes through
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args, **kwargs):
+            result = await call(*args, **kwargs)
+            return dump(result, status_code) or result
+    else:
+        @functools.wraps(call)
+        def endpoint(*args, **kwargs):
+            result = call(*args, **kwargs)
+            return dump(result, status_code) or result
+    return endpoint
+
+
+class JSONBodyRoute(APIRoute):
+    def single_model_field(self):
+        field = self.body_field
+        if field is None or len(self.dependant.body_params) != 1 or self._embed_body_fields:
+            return None
+        if isinstance(field.field_info, Form) or body_model(field.field_info.annotation) is None:
+            return None
+        return field
+
+    def get_route_handler(self):
+        dependant = self.dependant
+        if (self.response_field is None and dependant.response_param_name is None
+                and isinstance(self.response_class, DefaultPlaceholder)
+                and self.response_class.value is JSONResponse):
+            self.dependant = copy.copy(dependant)  # as in instrumentation.py: FastAPI's handler gets the wrapper
+            self.dependant.call = dumped(dependant.call, self.status_code or 200)
+        try:
+            handler = super().get_route_handler()
+        finally:
+            self.dependant = dependant
+        field = self.single_model_field()
+        if field is None:
+            return handler
+        adapter = field._type_adapter  # the TypeAdapter FastAPI itself validates this body with
+
+        async def from_bytes(request):
+            body = await request.body()
+            if body and is_json(request.headers.get('content-type', '')):
+                try:
+                    request._json = adapter.validate_json(body)  # what request.json() returns to FastAPI
+                except ValidationError:
+                    pass  # FastAPI parses and validates again and reports the errors its usual way
+            return await handler(request)
+        return from_bytes
@@ -0,0 +1,80 @@
+# Route metrics → request counts, in-flight gauges and phase latency histograms in Prometheus text format
+# An observer for shared.instrumentation: every request costs a few dict lookups and one bisect per phase, all
+# on the event loop, so no locks. Series are keyed by route template, never by raw path, to keep them bounded.
+
+from bisect import bisect_left
+from collections import defaultdict
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ('counts', 'sum')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+
+
+def labels(**values):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(values, escaped)) + '}'
+
+
+class RouteMetrics:
+    def __init__(self, namespace='http'):
+        self.namespace = namespace
+        self.requests = defaultdict(int)         # (method, route, status) → count
+        self.in_flight = defaultdict(int)        # (method, route) → requests being handled
+        self.latency = defaultdict(Histogram)    # (method, route) → whole request
+        self.phases = defaultdict(Histogram)     # (method, route, phase) → one phase
+
+    def start(self, timing):
+        self.in_flight[timing.method, timing.route] += 1
+
+    def finish(self, timing):
+        key = timing.method, timing.route
+        self.in_flight[key] -= 1
+        self.requests[key + (timing.status,)] += 1
+        self.latency[key].observe(timing.end - timing.start)
+        for phase, seconds in timing.phases():
+            self.phases[key + (phase,)].observe(seconds)
+
+    def render(self):
+        ns = self.namespace
+        lines = [f'# HELP {ns}_requests_total Requests handled, by route template and status code',
+                 f'# TYPE {ns}_requests_total counter']
+        for (method, route, status), count in sorted(self.requests.items(), key=str):
+            lines.append(f'{ns}_requests_total{labels(method=method, route=route, status=status)} {count}')
+
+        lines += [f'# HELP {ns}_requests_in_flight Requests currently being handled',
+                  f'# TYPE {ns}_requests_in_flight gauge']
+        for (method, route), count in sorted(self.in_flight.items()):
+            lines.append(f'{ns}_requests_in_flight{labels(method=method, route=route)} {count}')
+
+        lines += [f'# HELP {ns}_request_duration_seconds Time from route match to response',
+                  f'# TYPE {ns}_request_duration_seconds histogram']
+        for (method, route), histogram in sorted(self.latency.items()):
+            self._histogram(lines, f'{ns}_request_duration_seconds', histogram, method=method, route=route)
+
+        lines += [f'# HELP {ns}_request_phase_duration_seconds Time per phase: parse, handler, serialize',
+                  f'# TYPE {ns}_request_phase_duration_seconds histogram']
+        for (method, route, phase), histogram in sorted(self.phases.items()):
+            self._histogram(lines, f'{ns}_request_phase_duration_seconds', histogram,
+                            method=method, route=route, phase=phase)
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _histogram(lines, name, histogram, **values):
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ('+Inf',), histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{labels(**values, le=bound)} {cumulative}')
+        lines.append(f'{name}_sum{labels(**values)} {histogram.sum}')
+        lines.append(f'{name}_count{labels(**values)} {cumulative}')
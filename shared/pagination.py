@@ -0,0 +1,20 @@
+# Keyset pagination → opaque cursor tokens
+# A cursor encodes the sort key of the last item a client has seen, so the next page resumes right after it
+# (a bisect / index seek) instead of re-counting `offset` items, and stays stable while items are added or removed.
+
+import base64
+import json
+
+
+def encode_cursor(key):
+    raw = json.dumps(key, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(token):
+    # Raises ValueError for anything that was not produced by encode_cursor
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        return json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'Invalid cursor {token!r}') from e
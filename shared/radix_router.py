@@ -0,0 +1,125 @@
+# Radix router → match a request against a prefix tree of path segments instead of every route's regex in turn
+# Starlette tries each route in declaration order, so matching cost grows with the route table. The tree walks
+# one node per path segment and only runs the regex (and converters) of the routes it ends up at.
+# Precedence at every segment: static text, then {params} (typed converters such as {item_id:int} are checked
+# per segment with the converter's own regex), then {name:path} catch-alls, then declaration order — so
+# /users/me wins over /users/{user_id} even if declared after it, which the linear scan would not do.
+# Routes the tree cannot express (mounts, websockets, segments mixing text and params like /v{major}.{minor})
+# and every request the tree cannot resolve to a full match (404, 405, slash redirects) go through the
+# router's normal linear scan, so behaviour there is unchanged.
+
+import re
+
+from starlette.routing import Match, Route # type: ignore
+
+
+PARAM = re.compile(r'^\{([a-zA-Z_][a-zA-Z0-9_]*)(?::([a-zA-Z_][a-zA-Z0-9_]*))?\}$')
+
+
+class Node:
+    __slots__ = ('static', 'params', 'catch_all', 'routes')
+
+    def __init__(self):
+        self.static = {}      # segment text → Node
+        self.params = {}      # converter regex → (compiled, Node)
+        self.catch_all = []   # routes ending in {name:path} here: they match any remainder, slashes included
+        self.routes = []      # routes ending exactly at this node
+
+    def candidates(self, segments, i):
+        # Routes that may match segments[i:], best first
+        if i == len(segments):
+            yield from self.routes
+        else:
+            segment = segments[i]
+            child = self.static.get(segment)
+            if child is not None:
+                yield from child.candidates(segments, i + 1)
+            for compiled, child in self.params.values():
+                if compiled.fullmatch(segment):
+                    yield from child.candidates(segments, i + 1)
+        yield from self.catch_all
+
+
+def segments_of(route):
+    # Route → [(kind, value)] with kind 'static' | 'param' | 'path', or None if the tree cannot represent it
+    if not isinstance(route, Route):
+        return None
+    parts = route.path.split('/')[1:]
+    result = []
+    for n, part in enumerate(parts):
+        if '{' not in part:
+            result.append(('static', part))
+            continue
+        param = PARAM.match(part)
+        if param is None:
+            return None
+        name, convertor = param.groups()
+        if convertor == 'path':
+            if n != len(parts) - 1:
+                return None
+            result.append(('path', None))
+        else:
+            result.append(('param', route.param_convertors[name].regex))
+    return result
+
+
+class RadixMatcher:
+    def __init__(self, router):
+        self.router = router
+        self.root = None
+        self.routes_seen = None
+
+    def build(self):
+        root = Node()
+        for route in self.router.routes:
+            segments = segments_of(route)
+            if segments is None:
+                continue
+            node = root
+            for kind, value in segments:
+                if kind == 'static':
+                    node = node.static.setdefault(value, Node())
+                elif kind == 'param':
+                    if value not in node.params:
+                        node.params[value] = (re.compile(value), Node())
+                    node = node.params[value][1]
+                else:
+                    node.catch_all.append(route)
+                    break
+            else:
+                node.routes.append(route)
+        self.root = root
+        self.routes_seen = len(self.router.routes)
+
+    def match(self, scope):
+        # (route, child_scope) for the best full match, or None
+        if self.routes_seen != len(self.router.routes):
+            self.build()  # routes were added since the tree was built
+        root_path = scope.get('root_path', '')
+        path = scope['path']
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        for route in self.root.candidates(path.split('/')[1:], 0):
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return route, child_scope
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            found = self.match(scope)
+            if found is not None:
+                route, child_scope = found
+                scope.setdefault('router', self.router)
+                scope.update(child_scope)
+                scope['route'] = route
+                await route.handle(scope, receive, send)
+                return
+        await self.router.app(scope, receive, send)  # lifespan, websockets, 404 / 405 / redirects, mounts
+
+
+def install_radix_router(app):
+    # Swaps the router's dispatch for the tree; the routes list itself (and OpenAPI) is untouched
+    matcher = RadixMatcher(app.router)
+    app.router.middleware_stack = matcher
+    return matcher
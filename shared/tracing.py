@@ -0,0 +1,79 @@
+# Slow-request tracing → span breakdown of only the requests worth looking at (tail sampling)
+# An observer for shared.instrumentation. Every request is timed anyway; the decision to keep its trace is made
+# once it has finished, so only requests slower than `threshold` seconds or answered with a 5xx cost anything.
+# Kept traces go to a bounded ring buffer (for a debug endpoint) and, via a writer thread, to a JSONL file.
+
+import collections
+import datetime
+import json
+import logging
+import queue
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class SlowRequestTracer:
+    def __init__(self, threshold=0.1, capacity=200, path=None):
+        self.threshold = threshold
+        self.traces = collections.deque(maxlen=capacity)  # newest last
+        self.seen = 0
+        self.kept = 0
+        self.path = path                                   # JSONL file, or None to keep traces in memory only
+        self._pending = queue.SimpleQueue()
+        self._writer = None
+
+    def start(self, timing):
+        pass
+
+    def finish(self, timing):
+        self.seen += 1
+        began = timing.received if timing.received is not None else timing.start
+        duration = timing.end - began
+        failed = timing.status is None or timing.status >= 500  # no status: the app raised before responding
+        if duration < self.threshold and not failed:
+            return
+        self.kept += 1
+        trace = {
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'method': timing.method,
+            'route': timing.route,
+            'target': timing.target,
+            'status': timing.status,
+            'error': timing.error,
+            'duration_ms': round(duration * 1000, 3),
+            'spans': [
+                {'name': name, 'start_ms': round((start - began) * 1000, 3), 'duration_ms': round((end - start) * 1000, 3)}
+                for name, start, end in timing.spans()
+            ],
+        }
+        self.traces.append(trace)
+        if self.path:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write, name='trace-writer', daemon=True)
+                self._writer.start()
+            self._pending.put(trace)
+
+    def recent(self, limit=50, route=None):
+        traces = [t for t in reversed(self.traces) if route is None or t['route'] == route]
+        return traces[:limit]
+
+    def status(self):
+        return {'threshold_ms': self.threshold * 1000, 'seen': self.seen, 'kept': self.kept,
+                'buffered': len(self.traces), 'file': self.path}
+
+    def _write(self):
+        # Writer thread: blocks for the next trace, then drains whatever else is queued in one write + flush
+        while True:
+            batch = [self._pending.get()]
+            while True:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(trace, ensure_ascii=False) + '\n' for trace in batch)
+            except OSError:
+                logger.exception('Writing %d traces to %s failed', len(batch), self.path)
@@ -0,0 +1,124 @@
+# Startup warm-up → OpenAPI schema built (or loaded from a content-hashed disk cache) and the middleware stack
+# assembled before the first request, instead of lazily on the first /docs or /openapi.json hit after a deploy.
+# Route validators need no step here: FastAPI compiles them when each route is declared.
+# Call warm_up(app, …) once every route is declared. The cache key hashes the FastAPI / Pydantic versions, the
+# app metadata, every route's path and methods, and the source of every module that defines an endpoint or a
+# body / response model, so any change that could alter the schema picks a new file.
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pathlib
+import sys
+import tempfile
+from time import perf_counter
+
+import fastapi # type: ignore
+import pydantic # type: ignore
+from fastapi.routing import APIRoute # type: ignore
+from pydantic import BaseModel # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+
+def route_fields(route):
+    dependant = route.dependant
+    fields = [*dependant.path_params, *dependant.query_params, *dependant.header_params,
+              *dependant.cookie_params, *dependant.body_params]
+    return fields + [field for field in (route.body_field, route.response_field) if field is not None]
+
+
+def models_of(annotation, found):
+    # BaseModel subclasses used anywhere inside a (possibly nested / generic) annotation
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        if annotation not in found:
+            found.add(annotation)
+            for field in annotation.model_fields.values():
+                models_of(field.annotation, found)
+    for arg in getattr(annotation, '__args__', ()):
+        models_of(arg, found)
+    return found
+
+
+def schema_key(app):
+    routes = [route for route in app.routes if isinstance(route, APIRoute)]
+    models = set()
+    for route in routes:
+        for field in route_fields(route):
+            models_of(field.field_info.annotation, models)
+    modules = {route.endpoint.__module__ for route in routes} | {model.__module__ for model in models}
+    digest = hashlib.sha256()
+    digest.update(f'{fastapi.__version__} {pydantic.VERSION} {app.title} {app.version} {app.openapi_version}'.encode())
+    for route in routes:
+        digest.update(f'{sorted(route.methods)} {route.path}'.encode())
+    for name in sorted(modules):
+        source = getattr(sys.modules.get(name), '__file__', None)
+        if source:
+            digest.update(pathlib.Path(source).read_bytes())
+    return digest.hexdigest()[:16], models
+
+
+def load_or_build_schema(app, cache_dir):
+    key, models = schema_key(app)
+    if cache_dir is None:
+        return app.openapi(), 'built', models
+    cache_dir = pathlib.Path(cache_dir)
+    path = cache_dir / f'openapi-{key}.json'
+    try:
+        return json.loads(path.read_bytes()), 'cache', models
+    except FileNotFoundError:
+        pass
+    schema = app.openapi()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for stale in cache_dir.glob('openapi-*.json'):
+        stale.unlink(missing_ok=True)
+    with tempfile.NamedTemporaryFile('w', dir=cache_dir, suffix='.tmp', delete=False) as f:
+        json.dump(schema, f)
+    os.replace(f.name, path)  # atomic: concurrent workers never read a half-written file
+    return schema, 'built', models
+
+
+class FirstRequestTimer:
+    # ASGI middleware that records how long the first HTTP request took, then gets out of the way
+    def __init__(self, app, report):
+        self.app = app
+        self.report = report
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or 'first_request_ms' in self.report:
+            return await self.app(scope, receive, send)
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if 'first_request_ms' not in self.report:
+                self.report['first_request_ms'] = round((perf_counter() - start) * 1000, 3)
+                self.report['first_request'] = scope['path']
+                logger.info('First request %s took %.1f ms', scope['path'], self.report['first_request_ms'])
+
+
+def warm_up(app, cache_dir=None, import_started=None):
+    # Returns (and stores in app.state.startup) the timings of each step in milliseconds
+    report = {}
+    start = perf_counter()
+    if import_started is not None:
+        report['import_ms'] = round((start - import_started) * 1000, 3)
+
+    schema, source, models = load_or_build_schema(app, cache_dir)
+    app.openapi = lambda: schema  # the documented way to replace FastAPI's lazily built schema
+    schema_done = perf_counter()
+    report['schema_ms'] = round((schema_done - start) * 1000, 3)
+    report['schema_source'] = source
+
+    report['models'] = len(models)
+
+    app.add_middleware(FirstRequestTimer, report=report)
+    app.middleware_stack = app.build_middleware_stack()  # otherwise assembled during the first request
+    report['middleware_ms'] = round((perf_counter() - schema_done) * 1000, 3)
+
+    app.state.startup = report
+    logger.info('Warm-up: %s', report)
+    return report